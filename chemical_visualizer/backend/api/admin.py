@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Dataset
+from .models import Dataset, EquipmentStat
 
 
 @admin.register(Dataset)
@@ -8,3 +8,10 @@ class DatasetAdmin(admin.ModelAdmin):
 	list_display = ("id", "name", "uploaded_at", "row_count")
 	search_fields = ("name",)
 	ordering = ("-uploaded_at",)
+
+
+@admin.register(EquipmentStat)
+class EquipmentStatAdmin(admin.ModelAdmin):
+	list_display = ("equipment_name", "type", "dataset", "count")
+	search_fields = ("equipment_name",)
+	list_filter = ("type",)
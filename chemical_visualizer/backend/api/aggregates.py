@@ -0,0 +1,99 @@
+"""Chart aggregates computed directly over a dataset's columnar store.
+
+Everything here works on whole numpy columns, so the response size depends
+only on the requested bins and points, never on how many rows were uploaded.
+"""
+import numpy as np
+
+from .columns import NUMERIC_COLUMNS
+
+
+DEFAULT_BINS = 20
+MAX_BINS = 200
+DEFAULT_POINTS = 1000
+MAX_POINTS = 10000
+PERCENTILES = (25, 50, 75)
+
+# Sampling is seeded so the same dataset always yields the same points, which
+# keeps the response cacheable and its ETag meaningful.
+SAMPLE_SEED = 0
+
+
+def _finite(values: np.ndarray) -> np.ndarray:
+    return values[~np.isnan(values)]
+
+
+def histograms(store, bins=DEFAULT_BINS) -> dict:
+    result = {}
+    for column in NUMERIC_COLUMNS:
+        values = _finite(store.raw(column))
+        if len(values) == 0:
+            result[column] = {"edges": [], "counts": []}
+            continue
+        counts, edges = np.histogram(values, bins=bins)
+        result[column] = {"edges": edges.tolist(), "counts": counts.tolist()}
+    return result
+
+
+def _describe(values: np.ndarray) -> dict:
+    values = _finite(values)
+    if len(values) == 0:
+        return {"mean": None, "min": None, "max": None, "std": None, **{f"p{q}": None for q in PERCENTILES}}
+    stats = {
+        "mean": float(values.mean()),
+        "min": float(values.min()),
+        "max": float(values.max()),
+        "std": float(values.std(ddof=1)) if len(values) > 1 else None,
+    }
+    for q, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+        stats[f"p{q}"] = float(value)
+    return stats
+
+
+def type_stats(store) -> dict:
+    """Per-``Type`` count and mean/min/max/std/percentiles of every numeric column."""
+    codes = np.asarray(store.raw("Type"))
+    order = np.argsort(codes, kind="stable")
+    sorted_codes = codes[order]
+    starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]]) if len(codes) else []
+    bounds = list(zip(starts, list(starts[1:]) + [len(codes)]))
+    dictionary = store.dictionary("Type")
+    columns = {column: np.asarray(store.raw(column))[order] for column in NUMERIC_COLUMNS}
+
+    result = {}
+    for start, stop in bounds:
+        name = dictionary[sorted_codes[start]]
+        if name is None:
+            continue
+        group = {"count": int(stop - start)}
+        for column, values in columns.items():
+            group[column] = _describe(values[start:stop])
+        result[name] = group
+    return dict(sorted(result.items(), key=lambda item: item[1]["count"], reverse=True))
+
+
+def scatter(store, x="Flowrate", y="Pressure", points=DEFAULT_POINTS) -> dict:
+    """Uniform random sample of at most ``points`` rows, in stored order."""
+    for column in (x, y):
+        if column not in NUMERIC_COLUMNS:
+            raise ValueError(f"Unknown numeric column: {column}")
+    total = store.row_count
+    if total <= points:
+        rows = slice(None)
+    else:
+        rows = np.sort(np.random.default_rng(SAMPLE_SEED).choice(total, size=points, replace=False))
+    return {
+        "x": x,
+        "y": y,
+        "total": total,
+        "data": store.column_lists([x, y, "Type"], rows=rows),
+    }
+
+
+def aggregate(store, bins=DEFAULT_BINS, points=DEFAULT_POINTS, x="Flowrate", y="Pressure") -> dict:
+    return {
+        "row_count": store.row_count,
+        "histograms": histograms(store, bins),
+        "by_type": type_stats(store),
+        "scatter": scatter(store, x, y, points),
+    }
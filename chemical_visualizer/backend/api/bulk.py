@@ -0,0 +1,203 @@
+"""Bulk ingestion of several CSV uploads, or of the CSV members of archives.
+
+Zip members are read straight out of the archive. A tar has no index, and
+seeking to a member of a compressed one decompresses everything before it, so
+tar uploads are read once, front to back: each CSV member is copied to a
+temporary file and hashed as it goes by. Every source is then parsed into its
+own columnar store on a thread pool. The Datasets for the whole batch are then
+created in one transaction, followed by a single eviction pass.
+"""
+import hashlib
+import io
+import os
+import tarfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.db import transaction
+
+from .datasets import evict_old_datasets, ingest_file, record_dataset
+from .ingest import InvalidCSVError
+from .models import Dataset
+from .parallel import local_path
+from .storage import delete_store
+from .uploadhandlers import file_digest
+
+
+ZIP_SUFFIXES = (".zip",)
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz")
+
+
+class InvalidArchiveError(InvalidCSVError):
+    def __init__(self, message="Invalid archive file"):
+        super().__init__(message)
+
+
+class TooManyFilesError(InvalidCSVError):
+    def __init__(self):
+        super().__init__(f"At most {settings.BULK_UPLOAD_MAX_FILES} files per upload")
+
+
+def _is_csv_member(name: str) -> bool:
+    base = os.path.basename(name)
+    return name.lower().endswith(".csv") and not base.startswith(".") and "__MACOSX/" not in name
+
+
+def _reader(upload):
+    """Return a callable opening an independent handle on ``upload``'s bytes."""
+    path = local_path(upload)
+    if path:
+        return lambda: open(path, "rb")
+    upload.seek(0)
+    data = upload.read()
+    return lambda: io.BytesIO(data)
+
+
+def _member_file(stream, name: str, size: int) -> File:
+    member = File(stream, name=os.path.basename(name))
+    # Otherwise ``File`` would look for a file called ``name`` on disk.
+    member.size = size
+    return member
+
+
+def _zip_sources(upload) -> list:
+    reader = _reader(upload)
+    try:
+        with reader() as handle:
+            members = [info for info in zipfile.ZipFile(handle).infolist() if _is_csv_member(info.filename)]
+    except zipfile.BadZipFile as exc:
+        raise InvalidArchiveError() from exc
+
+    def opener(info):
+        def open_member(stack):
+            archive = stack.enter_context(zipfile.ZipFile(stack.enter_context(reader())))
+            return _member_file(stack.enter_context(archive.open(info)), info.filename, info.file_size)
+        return open_member
+
+    return [(info.filename, opener(info)) for info in members]
+
+
+def _stage_member(stream, info, stack) -> tuple:
+    """Copy a tar member to a temporary file; return ``(file, digest)``."""
+    staged = stack.enter_context(
+        TemporaryUploadedFile(os.path.basename(info.name), "text/csv", info.size, None)
+    )
+    hasher = hashlib.sha256()
+    while block := stream.read(File.DEFAULT_CHUNK_SIZE):
+        hasher.update(block)
+        staged.write(block)
+    staged.seek(0)
+    return staged, hasher.hexdigest()
+
+
+def _tar_sources(upload, stack, limit: int) -> list:
+    sources = []
+    try:
+        # "r|*" reads the archive as a stream, in order, decompressing it once.
+        with _reader(upload)() as handle, tarfile.open(fileobj=handle, mode="r|*") as archive:
+            for info in archive:
+                if not (info.isfile() and _is_csv_member(info.name)):
+                    continue
+                if len(sources) == limit:
+                    raise TooManyFilesError()
+                staged, digest = _stage_member(archive.extractfile(info), info, stack)
+                sources.append((info.name, lambda stack, staged=staged: staged, digest))
+    except tarfile.TarError as exc:
+        raise InvalidArchiveError() from exc
+    return sources
+
+
+def collect_sources(uploads, stack, digests=None) -> list:
+    """Expand uploads into ``(name, open_member, known_digest)`` sources.
+
+    Plain CSV uploads are used as they are. Zip and tar(.gz) uploads
+    contribute one source per ``.csv`` member. ``digests`` holds the known
+    digest of each upload, by position. Tar members are staged in temporary
+    files that are removed when ``stack`` closes.
+    """
+    digests = digests or [""] * len(uploads)
+    sources = []
+    for upload, digest in zip(uploads, digests):
+        lower = upload.name.lower()
+        if lower.endswith(ZIP_SUFFIXES):
+            sources.extend((name, opener, "") for name, opener in _zip_sources(upload))
+        elif lower.endswith(TAR_SUFFIXES):
+            sources.extend(_tar_sources(upload, stack, settings.BULK_UPLOAD_MAX_FILES - len(sources)))
+        else:
+            sources.append((upload.name, lambda stack, upload=upload: upload, digest))
+        if len(sources) > settings.BULK_UPLOAD_MAX_FILES:
+            raise TooManyFilesError()
+    return sources
+
+
+def _digest(file, known: str) -> str:
+    return known or file_digest(file)
+
+
+def _parse(file):
+    try:
+        return ingest_file(file)
+    except InvalidCSVError as exc:
+        return exc
+
+
+def ingest_bulk(sources) -> list:
+    """Ingest ``sources`` from ``collect_sources``; return one result per source."""
+    results = [{"name": name} for name, _, _ in sources]
+    parsed = {}
+    with ExitStack() as stack, ThreadPoolExecutor(max_workers=settings.BULK_UPLOAD_WORKERS) as pool:
+        files = [open_member(stack) for _, open_member, _ in sources]
+        hashes = list(pool.map(_digest, files, [digest for _, _, digest in sources]))
+
+        # Skip anything already stored, or repeated earlier in the same batch.
+        existing = dict(
+            Dataset.objects.filter(content_hash__in=set(hashes))
+            .order_by("uploaded_at")
+            .values_list("content_hash", "pk")
+        )
+        first_seen = {}
+        for index, content_hash in enumerate(hashes):
+            if content_hash in existing:
+                results[index].update(status="duplicate", dataset=existing[content_hash])
+            elif content_hash in first_seen:
+                results[index].update(status="duplicate", duplicate_of=first_seen[content_hash])
+            else:
+                first_seen[content_hash] = index
+
+        outcomes = dict(zip(first_seen.values(), pool.map(_parse, [files[i] for i in first_seen.values()])))
+        for index, outcome in outcomes.items():
+            if isinstance(outcome, InvalidCSVError):
+                results[index].update(status="failed", error=outcome.payload)
+            else:
+                parsed[index] = outcome
+
+        try:
+            with transaction.atomic():
+                for index, (writer, stats) in parsed.items():
+                    name = results[index]["name"]
+                    dataset = record_dataset(files[index], os.path.basename(name), writer, stats, hashes[index])
+                    results[index].update(status="created", dataset=dataset.pk)
+        except Exception:
+            for writer, _ in parsed.values():
+                delete_store(writer.relative_path)
+            raise
+
+    for result in results:
+        if "duplicate_of" in result:
+            first = results[result.pop("duplicate_of")]
+            if first["status"] == "failed":
+                result.update(status="failed", error=first["error"])
+            else:
+                result["dataset"] = first["dataset"]
+
+    if parsed:
+        evict_old_datasets()
+        created = [results[index]["dataset"] for index in parsed]
+        kept = set(Dataset.objects.filter(pk__in=created).values_list("pk", flat=True))
+        for index in parsed:
+            results[index]["evicted"] = results[index]["dataset"] not in kept
+    return results
@@ -0,0 +1,74 @@
+import hashlib
+
+from django.core.cache import caches
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+CACHE_ALIAS = "datasets"
+
+# Representations of a dataset detail that may be cached; see ``detail_key``.
+# Rows come as a list of records or as one list per column.
+DETAIL_VARIANTS = ("rows-records", "rows-columns", "meta")
+
+# Fields needed to answer a conditional request without loading the dataset.
+VALIDATOR_FIELDS = ("id", "content_hash", "uploaded_at", "row_count")
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+
+def dataset_etag(dataset, *parts) -> str:
+    """Strong ETag for a resource derived from an (immutable) dataset."""
+    version = dataset.content_hash[:16] or int(dataset.uploaded_at.timestamp())
+    return quote_etag("-".join(str(part) for part in ("dataset", dataset.pk, version, *parts)))
+
+
+def collection_etag(name: str, datasets) -> str:
+    """ETag for a list of datasets, which changes whenever its members do."""
+    digest = hashlib.sha256()
+    for dataset in datasets:
+        digest.update(f"{dataset.pk}:{dataset.content_hash}:{dataset.uploaded_at.isoformat()};".encode())
+    return quote_etag(f"{name}-{digest.hexdigest()[:32]}")
+
+
+def set_validators(response, etag: str, last_modified=None, immutable=False):
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    if immutable:
+        patch_cache_control(response, private=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+    else:
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def conditional_response(request, etag: str, last_modified=None, immutable=False):
+    """Return a 304/412 response if the request's preconditions say so, else None."""
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified is not None else None,
+    )
+    if response is not None:
+        set_validators(response, etag, last_modified, immutable)
+    return response
+
+
+def detail_key(dataset, variant: str) -> str:
+    # Keyed like the ETag, so a reused primary key can never hit an old entry.
+    return f"dataset-detail:{dataset_etag(dataset, variant)}"
+
+
+def cached_payload(key: str, build, cacheable=True):
+    """Return the payload stored under ``key``, building (and caching) it on a miss."""
+    cache = caches[CACHE_ALIAS]
+    payload = cache.get(key)
+    if payload is None:
+        payload = build()
+        if cacheable:
+            cache.set(key, payload)
+    return payload
+
+
+def invalidate_dataset(dataset) -> None:
+    caches[CACHE_ALIAS].delete_many([detail_key(dataset, variant) for variant in DETAIL_VARIANTS])
@@ -0,0 +1,9 @@
+REQUIRED_COLUMNS = [
+    "Equipment Name",
+    "Type",
+    "Flowrate",
+    "Pressure",
+    "Temperature",
+]
+
+NUMERIC_COLUMNS = ["Flowrate", "Pressure", "Temperature"]
@@ -0,0 +1,102 @@
+"""Side-by-side and merged statistics for several datasets.
+
+Merged totals come from the stored ``SummaryAccumulator`` states; per-Type
+and per-equipment breakdowns are grouped with ``np.bincount`` over the
+dictionary codes in each columnar store. No CSV is read again.
+"""
+import numpy as np
+
+from .columns import NUMERIC_COLUMNS
+from .storage import open_store
+from .summary import SummaryAccumulator
+
+
+MAX_DATASETS = 20
+DEFAULT_EQUIPMENT_LIMIT = 500
+MAX_EQUIPMENT_LIMIT = 5000
+
+
+def dataset_stats(dataset, store) -> SummaryAccumulator:
+    if dataset.stats:
+        return SummaryAccumulator.from_state(dataset.stats)
+    # Datasets ingested before stats were stored.
+    stats = SummaryAccumulator().update(store.read(NUMERIC_COLUMNS + ["Type"]))
+    stats.observe_raw((dataset.summary or {}).get("total_raw", stats.count))
+    return stats
+
+
+def group_means(store, key: str) -> dict:
+    """Return ``{value of key: (count, {column: mean})}`` for one store."""
+    codes = np.asarray(store.raw(key))
+    present = codes >= 0
+    codes = codes[present]
+    names = store.dictionary(key)[:-1]
+    counts = np.bincount(codes, minlength=len(names))
+    sums = {
+        column: np.bincount(codes, weights=np.asarray(store.raw(column))[present], minlength=len(names))
+        for column in NUMERIC_COLUMNS
+    }
+    return {
+        names[index]: (int(counts[index]), {column: float(sums[column][index] / counts[index]) for column in NUMERIC_COLUMNS})
+        for index in np.flatnonzero(counts)
+    }
+
+
+def _series(groups: list, name) -> dict:
+    """One list per metric, aligned with the datasets; ``None`` where absent."""
+    found = [group.get(name) for group in groups]
+    series = {"count": [entry[0] if entry else 0 for entry in found]}
+    for column in NUMERIC_COLUMNS:
+        series[column] = [entry[1][column] if entry else None for entry in found]
+    return series
+
+
+def _delta(series: dict) -> dict:
+    delta = {}
+    for column in NUMERIC_COLUMNS:
+        values = [value for value in series[column] if value is not None]
+        delta[column] = values[-1] - values[0]
+    return delta
+
+
+def compare(datasets, equipment_limit=DEFAULT_EQUIPMENT_LIMIT) -> dict:
+    """Compare ``datasets`` (oldest first); every list in the result follows that order."""
+    merged = SummaryAccumulator()
+    type_groups, equipment_groups = [], []
+    for dataset in datasets:
+        store = open_store(dataset)
+        merged.merge(dataset_stats(dataset, store))
+        type_groups.append(group_means(store, "Type"))
+        equipment_groups.append(group_means(store, "Equipment Name"))
+
+    types = sorted(set().union(*type_groups), key=lambda name: -merged.type_counts.get(name, 0))
+
+    # Deltas only make sense for equipment that appears in at least two uploads.
+    seen = {}
+    for group in equipment_groups:
+        for name in group:
+            seen[name] = seen.get(name, 0) + 1
+    shared = sorted(name for name, count in seen.items() if count > 1)
+    equipment = {}
+    for name in shared[:equipment_limit]:
+        series = _series(equipment_groups, name)
+        equipment[name] = {**series, "delta": _delta(series)}
+
+    summary = merged.to_summary()
+    summary["std"] = {column: merged.std(column) for column in NUMERIC_COLUMNS}
+    return {
+        "datasets": [
+            {
+                "id": dataset.pk,
+                "name": dataset.name,
+                "uploaded_at": dataset.uploaded_at,
+                "row_count": dataset.row_count,
+                "summary": dataset.summary,
+            }
+            for dataset in datasets
+        ],
+        "merged": summary,
+        "types": {name: _series(type_groups, name) for name in types},
+        "equipment": equipment,
+        "equipment_total": len(shared),
+    }
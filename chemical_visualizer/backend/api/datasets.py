@@ -0,0 +1,107 @@
+from django.conf import settings
+from django.db import transaction
+
+from .columns import REQUIRED_COLUMNS
+from .equipment import index_dataset
+from .ingest import ingest_csv
+from .metrics import count, span
+from .models import Dataset
+from .parallel import UnsplittableCSVError, ingest_csv_parallel, local_path, should_parallelize
+from .storage import ColumnarWriter, delete_store
+from .validation import Validator
+
+
+# Everything the post_delete handlers need to clean up after a dataset.
+EVICTION_FIELDS = ("id", "file", "storage_path", "report", "content_hash", "uploaded_at")
+
+
+def find_duplicate(content_hash: str):
+    if not content_hash:
+        return None
+    return Dataset.objects.filter(content_hash=content_hash).order_by("-uploaded_at").first()
+
+
+def ingest_file(file, on_progress=None) -> tuple:
+    """Parse ``file`` into a new columnar store; return ``(writer, stats)``.
+
+    Raises ``InvalidCSVError`` (or its ``MissingColumnsError`` subclass) when
+    the upload cannot be used; no files are left behind in that case.
+    """
+    path = local_path(file)
+    if should_parallelize(path):
+        try:
+            return _ingest_file(file, on_progress, path)
+        except UnsplittableCSVError:
+            # A quoted field spans a range boundary; start over serially.
+            count("parallel_fallbacks", 1)
+    return _ingest_file(file, on_progress)
+
+
+def _ingest_file(file, on_progress, parallel_path=None) -> tuple:
+    validator = Validator(settings.DATASET_VALIDATION)
+    with ColumnarWriter() as writer:
+        if parallel_path:
+            # Worker processes are not traced; time the parallel parse as a whole.
+            with span("parse_parallel"):
+                stats = ingest_csv_parallel(
+                    parallel_path, sink=writer.append, on_progress=on_progress, validator=validator
+                )
+            count("rows", stats.raw_count)
+        else:
+            stats = ingest_csv(file, sink=writer.append, on_progress=on_progress, validator=validator)
+        with span("error_report"):
+            errors = validator.save_report(writer.path)
+    writer.schema["errors"] = errors
+    return writer, stats
+
+
+def record_dataset(file, name: str, writer, stats, content_hash: str = "") -> Dataset:
+    """Create the Dataset (and its equipment index) for an ingested store.
+
+    Callers run this inside a transaction and delete the store if it fails.
+    """
+    with span("db_insert"):
+        dataset = Dataset.objects.create(
+            name=name,
+            file=file,
+            summary=stats.to_summary(),
+            stats=stats.to_state(),
+            row_count=stats.count,
+            columns=REQUIRED_COLUMNS,
+            storage_path=writer.relative_path,
+            schema=writer.schema,
+            content_hash=content_hash,
+        )
+    with span("equipment_index"):
+        index_dataset(dataset)
+    return dataset
+
+
+def create_dataset(file, name: str, on_progress=None, content_hash: str = "") -> Dataset:
+    """Ingest ``file`` into a new columnar store and record it as a Dataset.
+
+    Raises ``InvalidCSVError`` (or its ``MissingColumnsError`` subclass) when
+    the upload cannot be used; no files are left behind in that case.
+    """
+    writer, stats = ingest_file(file, on_progress)
+    try:
+        with transaction.atomic():
+            dataset = record_dataset(file, name, writer, stats, content_hash)
+    except Exception:
+        delete_store(writer.relative_path)
+        raise
+
+    with span("evict"):
+        evict_old_datasets()
+    return dataset
+
+
+def evict_old_datasets(keep: int = None) -> int:
+    """Delete all but the last ``keep`` uploads in one query; return how many went."""
+    if keep is None:
+        keep = settings.DATASET_HISTORY_LIMIT
+    stale = list(Dataset.objects.order_by("-uploaded_at").values_list("pk", flat=True)[keep:])
+    if not stale:
+        return 0
+    _, deleted = Dataset.objects.filter(pk__in=stale).only(*EVICTION_FIELDS).delete()
+    return deleted.get(Dataset._meta.label, 0)
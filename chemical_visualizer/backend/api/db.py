@@ -0,0 +1,23 @@
+"""Database helpers that depend on the backend in use."""
+from django.db import connection
+
+
+def copy_rows(model, fields, rows) -> None:
+    """Insert ``rows`` (tuples in ``fields`` order) into ``model``'s table.
+
+    PostgreSQL gets them through ``COPY ... FROM STDIN``; other backends
+    through one ``executemany``. Either way no model instances are built and
+    no SQL is compiled per batch, which is what dominates ``bulk_create`` for
+    large inserts. No signals are sent and primary keys are not returned.
+    """
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    columns = ", ".join(quote(model._meta.get_field(name).column) for name in fields)
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            with cursor.copy(f"COPY {table} ({columns}) FROM STDIN") as copy:
+                for row in rows:
+                    copy.write_row(row)
+        else:
+            placeholders = ", ".join(["%s"] * len(fields))
+            cursor.executemany(f"INSERT INTO {table} ({columns}) VALUES ({placeholders})", list(rows))
@@ -0,0 +1,119 @@
+"""Equipment-level index across datasets.
+
+At ingestion every dataset's rows are grouped by ``(Equipment Name, Type)``
+and written to ``EquipmentStat``, which is indexed on those two fields. The
+history of one piece of equipment is then a single indexed query, however
+many datasets exist, instead of a scan over every store.
+"""
+import numpy as np
+from django.db import transaction
+
+from .columns import NUMERIC_COLUMNS
+from .db import copy_rows
+from .models import EquipmentStat
+from .storage import open_store
+
+
+NAME_LENGTH = EquipmentStat._meta.get_field("equipment_name").max_length
+TYPE_LENGTH = EquipmentStat._meta.get_field("type").max_length
+
+FIELD_PREFIXES = {
+    "Flowrate": "flowrate",
+    "Pressure": "pressure",
+    "Temperature": "temperature",
+}
+
+STAT_FIELDS = (
+    "equipment_name",
+    "type",
+    "count",
+    *(f"{prefix}_{stat}" for prefix in FIELD_PREFIXES.values() for stat in ("mean", "min", "max")),
+)
+
+
+def group_stats(store) -> list:
+    """Return one dict per ``(name, type)`` pair with count and mean/min/max."""
+    names = np.asarray(store.raw("Equipment Name"))
+    types = np.asarray(store.raw("Type"))
+    present = (names >= 0) & (types >= 0)
+    if not present.any():
+        return []
+    names, types = names[present], types[present]
+
+    keys = names.astype(np.int64) * len(store.dictionary("Type")) + types
+    pairs, inverse = np.unique(keys, return_inverse=True)
+    order = np.argsort(inverse, kind="stable")
+    counts = np.bincount(inverse)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    metrics = {}
+    for column in NUMERIC_COLUMNS:
+        values = np.asarray(store.raw(column))[present]
+        sorted_values = values[order]
+        metrics[column] = (
+            np.bincount(inverse, weights=values) / counts,
+            np.minimum.reduceat(sorted_values, starts),
+            np.maximum.reduceat(sorted_values, starts),
+        )
+
+    name_dictionary = store.dictionary("Equipment Name")
+    type_dictionary = store.dictionary("Type")
+    first_rows = order[starts]
+    groups = []
+    for index, row in enumerate(first_rows):
+        group = {
+            # Truncated to the column sizes, so one odd name cannot fail an upload.
+            "equipment_name": name_dictionary[names[row]][:NAME_LENGTH],
+            "type": type_dictionary[types[row]][:TYPE_LENGTH],
+            "count": int(counts[index]),
+        }
+        for column, (means, mins, maxs) in metrics.items():
+            prefix = FIELD_PREFIXES[column]
+            group[f"{prefix}_mean"] = float(means[index])
+            group[f"{prefix}_min"] = float(mins[index])
+            group[f"{prefix}_max"] = float(maxs[index])
+        groups.append(group)
+    return groups
+
+
+def index_dataset(dataset, store=None) -> int:
+    """(Re)build the equipment rows of ``dataset``; return how many were written."""
+    groups = group_stats(store or open_store(dataset))
+    with transaction.atomic():
+        EquipmentStat.objects.filter(dataset=dataset).delete()
+        if groups:
+            copy_rows(
+                EquipmentStat,
+                ("dataset", *STAT_FIELDS),
+                ((dataset.pk, *(group[field] for field in STAT_FIELDS)) for group in groups),
+            )
+    return len(groups)
+
+
+def equipment_history(name: str, equipment_type=None) -> list:
+    """Readings of the equipment called ``name`` in every retained dataset, oldest first."""
+    readings = EquipmentStat.objects.filter(equipment_name=name)
+    if equipment_type:
+        readings = readings.filter(type=equipment_type)
+    readings = readings.select_related("dataset").only(
+        *(field.name for field in EquipmentStat._meta.concrete_fields),
+        "dataset__id",
+        "dataset__name",
+        "dataset__uploaded_at",
+    )
+
+    history = []
+    for reading in readings.order_by("dataset__uploaded_at", "dataset_id"):
+        entry = {
+            "dataset": reading.dataset_id,
+            "dataset_name": reading.dataset.name,
+            "uploaded_at": reading.dataset.uploaded_at,
+            "type": reading.type,
+            "count": reading.count,
+        }
+        for column, prefix in FIELD_PREFIXES.items():
+            entry[column] = {
+                stat: getattr(reading, f"{prefix}_{stat}") for stat in ("mean", "min", "max")
+            }
+        history.append(entry)
+    return history
@@ -0,0 +1,136 @@
+"""Downloads of a dataset's cleaned rows as CSV, Parquet or Excel.
+
+Rows are read from the columnar store ``EXPORT_CHUNK_ROWS`` at a time and
+encoded chunk by chunk, so the whole dataset is never held as one frame. Each
+encoded file is kept under ``exports/`` in the dataset's store directory,
+keyed by format, columns and types, and later requests are served from it; it
+is deleted with the store when the dataset is evicted. A CSV export that is
+not cached yet is streamed to the client while it is written.
+
+Parquet needs the optional ``pyarrow`` package and Excel needs ``openpyxl``;
+formats whose package is missing are not offered.
+"""
+import hashlib
+import json
+import os
+import uuid
+from pathlib import Path
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - optional dependency
+    pyarrow = None
+
+try:
+    import openpyxl
+except ImportError:  # pragma: no cover - optional dependency
+    openpyxl = None
+
+
+EXPORT_DIR = "exports"
+EXPORT_CHUNK_ROWS = 50_000
+
+# Excel's sheet size, less the header row.
+XLSX_MAX_ROWS = 1_048_575
+
+
+def _write_csv(selection, path: Path) -> None:
+    with open(path, "wb") as handle:
+        for chunk in csv_chunks(selection):
+            handle.write(chunk)
+
+
+def csv_chunks(selection):
+    for position, frame in enumerate(selection.frames(EXPORT_CHUNK_ROWS)):
+        yield frame.to_csv(index=False, header=position == 0, lineterminator="\n").encode("utf-8")
+
+
+def _write_parquet(selection, path: Path) -> None:
+    # Declared up front: a chunk whose text column is all missing would
+    # otherwise be inferred as a null column and not match the others.
+    schema = pyarrow.schema([
+        (column, pyarrow.string() if selection.store.is_dictionary(column) else pyarrow.float64())
+        for column in selection.columns
+    ])
+    with pyarrow.parquet.ParquetWriter(path, schema) as writer:
+        for frame in selection.frames(EXPORT_CHUNK_ROWS):
+            writer.write_table(pyarrow.Table.from_pandas(frame, schema=schema, preserve_index=False))
+
+
+def _write_xlsx(selection, path: Path) -> None:
+    if len(selection) > XLSX_MAX_ROWS:
+        raise ValueError(f"Excel exports are limited to {XLSX_MAX_ROWS} rows; use csv or parquet")
+    # A write-only workbook streams rows to disk instead of keeping cells.
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet("Cleaned data")
+    sheet.append(selection.columns)
+    for frame in selection.frames(EXPORT_CHUNK_ROWS):
+        for row in frame.astype(object).where(frame.notna(), None).itertuples(index=False, name=None):
+            sheet.append(row)
+    workbook.save(path)
+
+
+# format -> (content type, writer, whether the optional package is present)
+FORMATS = {
+    "csv": ("text/csv", _write_csv, True),
+    "parquet": ("application/vnd.apache.parquet", _write_parquet, pyarrow is not None),
+    "xlsx": (
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        _write_xlsx,
+        openpyxl is not None,
+    ),
+}
+
+
+def available_formats() -> list:
+    return [name for name, (_, _, available) in FORMATS.items() if available]
+
+
+def content_type(export_format: str) -> str:
+    return FORMATS[export_format][0]
+
+
+def export_filename(dataset, export_format: str) -> str:
+    return f"{Path(dataset.name).stem or 'dataset'}-cleaned.{export_format}"
+
+
+def export_path(selection, export_format: str, types: list) -> Path:
+    """Where the export of ``selection`` with this format and ``Type`` filter is cached."""
+    key = json.dumps([selection.columns, sorted(types)])
+    digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+    return selection.store.path / EXPORT_DIR / f"{digest}.{export_format}"
+
+
+def _temporary(path: Path) -> Path:
+    path.parent.mkdir(exist_ok=True)
+    return path.with_name(f".{uuid.uuid4().hex}{path.suffix}")
+
+
+def write_export(selection, export_format: str, path: Path) -> Path:
+    """Encode ``selection`` into the cached export at ``path``."""
+    temporary = _temporary(path)
+    try:
+        FORMATS[export_format][1](selection, temporary)
+        # Concurrent requests may write the same export; the last rename wins.
+        os.replace(temporary, path)
+    finally:
+        temporary.unlink(missing_ok=True)
+    return path
+
+
+def stream_csv_export(selection, path: Path):
+    """Yield the CSV export chunk by chunk, caching it at ``path`` once complete.
+
+    A client that disconnects part way leaves no cached file behind.
+    """
+    temporary = _temporary(path)
+    try:
+        with open(temporary, "wb") as handle:
+            for chunk in csv_chunks(selection):
+                handle.write(chunk)
+                yield chunk
+        os.replace(temporary, path)
+    finally:
+        temporary.unlink(missing_ok=True)
+
@@ -0,0 +1,98 @@
+import pandas as pd
+from django.conf import settings
+
+from .columns import REQUIRED_COLUMNS
+from .metrics import count, span
+from .summary import SummaryAccumulator
+from .validation import Validator
+
+
+# Text columns are pinned to ``str`` so pandas never has to guess per chunk;
+# numeric columns are left to the C parser and coerced afterwards, because a
+# float64 dtype would make a single bad cell abort the whole read.
+TEXT_DTYPES = {
+    "Equipment Name": str,
+    "Type": str,
+}
+
+
+class InvalidCSVError(ValueError):
+    def __init__(self, message="Invalid CSV file"):
+        super().__init__(message)
+
+    @property
+    def payload(self) -> dict:
+        return {"error": str(self)}
+
+
+class MissingColumnsError(InvalidCSVError):
+    def __init__(self, missing):
+        super().__init__("Missing required columns")
+        self.missing = missing
+
+    @property
+    def payload(self) -> dict:
+        return {"error": str(self), "missing": self.missing}
+
+
+def read_header(file) -> list:
+    file.seek(0)
+    try:
+        header = pd.read_csv(file, nrows=0)
+    except Exception as exc:
+        raise InvalidCSVError() from exc
+    finally:
+        file.seek(0)
+    return list(header.columns)
+
+
+def iter_chunks(file, chunk_size=None):
+    chunk_size = chunk_size or settings.CSV_CHUNK_SIZE
+    reader = pd.read_csv(
+        file,
+        usecols=REQUIRED_COLUMNS,
+        dtype=TEXT_DTYPES,
+        chunksize=chunk_size,
+    )
+    with reader:
+        while True:
+            try:
+                with span("read_csv"):
+                    chunk = next(reader)
+            except StopIteration:
+                return
+            except Exception as exc:
+                raise InvalidCSVError() from exc
+            yield chunk[REQUIRED_COLUMNS]
+
+
+def ingest_csv(file, sink=None, chunk_size=None, on_progress=None, validator=None) -> SummaryAccumulator:
+    """Parse ``file`` chunk by chunk and return its summary statistics.
+
+    Only one raw chunk is held in memory at a time. Each chunk is checked by
+    ``validator`` (built from ``DATASET_VALIDATION`` if not given), and the
+    rows it keeps are handed to ``sink`` (if given) so callers decide where
+    they end up. ``on_progress(rows_read, bytes_read)`` is called after every
+    chunk.
+    """
+    missing = [col for col in REQUIRED_COLUMNS if col not in read_header(file)]
+    if missing:
+        raise MissingColumnsError(missing)
+
+    validator = validator or Validator(settings.DATASET_VALIDATION)
+    stats = SummaryAccumulator()
+    for chunk in iter_chunks(file, chunk_size):
+        stats.observe_raw(len(chunk))
+        count("rows", len(chunk))
+        with span("validate"):
+            cleaned = validator.validate(chunk)
+        with span("summary"):
+            stats.update(cleaned)
+        if sink is not None:
+            with span("write"):
+                sink(cleaned)
+        if on_progress is not None:
+            on_progress(stats.raw_count, file.tell())
+
+    file.seek(0)
+    return stats
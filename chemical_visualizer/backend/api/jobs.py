@@ -0,0 +1,238 @@
+"""Background ingestion of staged uploads.
+
+Uploads are copied to ``MEDIA_ROOT/staging/`` and an ``IngestJob`` row is
+queued. The table is the queue: workers claim queued rows one at a time and
+parse them through the same ``create_dataset`` pipeline the synchronous
+upload uses. Each server process runs a small thread pool of workers, and
+``manage.py process_jobs`` can run more as a separate process.
+
+A running job touches ``heartbeat_at`` as it makes progress. When a process
+dies mid-job the heartbeat goes stale, and ``recover_jobs`` puts the job
+back in the queue, or fails it once it has used up its attempts. Recovery
+also runs when clients poll pending jobs, so work interrupted by a restart
+is picked up again. Setting ``INGEST_WORKERS`` to ``0`` runs jobs inline,
+which the tests rely on.
+"""
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .datasets import create_dataset, find_duplicate
+from .ingest import InvalidCSVError
+from .metrics import traced
+from .models import IngestJob
+from .reports import ensure_report
+from .storage import storage_root
+
+
+logger = logging.getLogger(__name__)
+
+STAGING_DIR = "staging"
+
+# Seconds between recovery passes triggered from requests, per process.
+RECOVERY_INTERVAL = 30
+
+_executor = None
+_executor_lock = threading.Lock()
+_last_recovery = float("-inf")
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.INGEST_WORKERS,
+                thread_name_prefix="ingest",
+            )
+    return _executor
+
+
+def stage_upload(file) -> str:
+    relative_path = f"{STAGING_DIR}/{uuid.uuid4().hex}.csv"
+    path = storage_root() / relative_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as handle:
+        for chunk in file.chunks():
+            handle.write(chunk)
+    return relative_path
+
+
+def submit_upload(file, content_hash: str = "") -> IngestJob:
+    job = IngestJob.objects.create(
+        name=file.name,
+        staged_path=stage_upload(file),
+        size=file.size or 0,
+        content_hash=content_hash,
+    )
+    enqueue(job)
+    return job
+
+
+def enqueue(job: IngestJob) -> None:
+    if settings.INGEST_WORKERS == 0:
+        claimed = claim_job(job.pk)
+        if claimed is not None:
+            run_job(claimed)
+        return
+    transaction.on_commit(_start_worker)
+
+
+def _start_worker() -> None:
+    _get_executor().submit(_run_in_worker)
+
+
+def claim_job(job_id=None):
+    """Move the oldest queued job (or ``job_id``) to RUNNING and return it.
+
+    Returns None when there is nothing to claim. On PostgreSQL the row is
+    locked with SKIP LOCKED so concurrent workers pick different jobs; the
+    conditional update makes the claim safe on SQLite too.
+    """
+    queued = IngestJob.objects.filter(status=IngestJob.QUEUED).order_by("created_at")
+    if job_id is not None:
+        queued = queued.filter(pk=job_id)
+    with transaction.atomic():
+        if connection.features.has_select_for_update_skip_locked:
+            queued = queued.select_for_update(skip_locked=True)
+        job = queued.first()
+        if job is None:
+            return None
+        claimed = IngestJob.objects.filter(pk=job.pk, status=IngestJob.QUEUED).update(
+            status=IngestJob.RUNNING,
+            attempts=F("attempts") + 1,
+            heartbeat_at=timezone.now(),
+        )
+    if not claimed:
+        return None
+    job.refresh_from_db()
+    return job
+
+
+def run_queued_jobs() -> int:
+    """Run queued jobs until none is left; return how many ran."""
+    ran = 0
+    while (job := claim_job()) is not None:
+        with traced("ingest-job"):
+            run_job(job)
+        ran += 1
+    return ran
+
+
+def _run_in_worker() -> None:
+    close_old_connections()
+    try:
+        run_queued_jobs()
+    finally:
+        close_old_connections()
+
+
+def recover_jobs() -> int:
+    """Requeue running jobs whose heartbeat is older than ``INGEST_JOB_TIMEOUT``.
+
+    A job that has used up ``INGEST_JOB_MAX_ATTEMPTS``, or whose staged file is
+    gone, is failed instead and its staged file removed. Returns how many
+    jobs were requeued.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.INGEST_JOB_TIMEOUT)
+    stale = IngestJob.objects.filter(
+        Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True), status=IngestJob.RUNNING
+    )
+    requeued = 0
+    for job in stale:
+        # Matching the heartbeat read above means a live worker, or another
+        # recovery pass, has not touched the job since.
+        unchanged = IngestJob.objects.filter(pk=job.pk, status=IngestJob.RUNNING, heartbeat_at=job.heartbeat_at)
+        path = storage_root() / job.staged_path
+        if job.staged_path and path.exists() and job.attempts < settings.INGEST_JOB_MAX_ATTEMPTS:
+            requeued += unchanged.update(status=IngestJob.QUEUED)
+            continue
+        failed = unchanged.update(
+            status=IngestJob.FAILED,
+            error={"error": "Ingestion was interrupted"},
+            finished_at=timezone.now(),
+        )
+        if failed and job.staged_path:
+            path.unlink(missing_ok=True)
+    return requeued
+
+
+def resume_jobs() -> None:
+    """Recover stale jobs and make sure queued ones have a worker.
+
+    Views call this while a client waits on a pending job. It runs at most
+    once every ``RECOVERY_INTERVAL`` seconds per process.
+    """
+    global _last_recovery
+    with _executor_lock:
+        if time.monotonic() - _last_recovery < RECOVERY_INTERVAL:
+            return
+        _last_recovery = time.monotonic()
+    recover_jobs()
+    if settings.INGEST_WORKERS == 0:
+        run_queued_jobs()
+    elif IngestJob.objects.filter(status=IngestJob.QUEUED).exists():
+        _start_worker()
+
+
+def run_job(job: IngestJob) -> None:
+    """Ingest a job claimed by ``claim_job`` and record the outcome."""
+    job_id = job.pk
+
+    def report(rows, bytes_read):
+        IngestJob.objects.filter(pk=job_id).update(
+            rows_processed=rows, bytes_processed=bytes_read, heartbeat_at=timezone.now()
+        )
+
+    path = storage_root() / job.staged_path
+    try:
+        # An identical upload may have finished while this one was queued.
+        dataset = find_duplicate(job.content_hash)
+        if dataset is None:
+            with open(path, "rb") as handle:
+                dataset = create_dataset(
+                    File(handle, name=job.name),
+                    job.name,
+                    on_progress=report,
+                    content_hash=job.content_hash,
+                )
+    except InvalidCSVError as exc:
+        _finish(job, IngestJob.FAILED, error=exc.payload)
+    except Exception:
+        logger.exception("Ingest job %s failed", job_id)
+        _finish(job, IngestJob.FAILED, error={"error": "Ingestion failed"})
+    else:
+        job.dataset = dataset
+        job.rows_processed = dataset.summary["total_raw"]
+        job.bytes_processed = job.size
+        _finish(job, IngestJob.SUCCEEDED, fields=["dataset", "rows_processed", "bytes_processed"])
+        _prerender_report(dataset)
+    finally:
+        path.unlink(missing_ok=True)
+
+
+def _prerender_report(dataset) -> None:
+    # We are already off the request path, so render the PDF now rather than
+    # on the first download. Failures just leave it to be rendered lazily.
+    try:
+        ensure_report(dataset)
+    except Exception:
+        logger.exception("Pre-rendering report for dataset %s failed", dataset.pk)
+
+
+def _finish(job: IngestJob, status: str, error=None, fields=()) -> None:
+    # Progress columns are written by ``report`` behind this instance's back,
+    # so only save what changed here.
+    job.status = status
+    job.error = error
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "error", "finished_at", *fields])
@@ -0,0 +1,209 @@
+"""
+Management command to benchmark ingestion, serialization and reporting.
+Usage: python manage.py benchmark --sizes 1000,100000,1000000 --output bench.json
+
+For every size it generates a synthetic equipment CSV. It then times, and
+measures the peak traced memory of, each stage of the upload and read paths.
+Everything runs against the configured database inside a transaction that is
+rolled back, with MEDIA_ROOT pointed at a temporary directory, so existing
+datasets are never touched or evicted.
+"""
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import django
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api.columns import REQUIRED_COLUMNS
+from api.datasets import create_dataset
+from api.reports import render_report
+from api.serializers import DatasetDetailSerializer
+from api.storage import open_store
+from api.streaming import detail_chunks
+from api.views import History, _build_summary
+
+
+DEFAULT_SIZES = "1000,10000,100000"
+GENERATE_BATCH_ROWS = 1_000_000
+EQUIPMENT_TYPES = ["Pump", "Valve", "Reactor", "Heat Exchanger", "Compressor", "Condenser"]
+
+
+class Rollback(Exception):
+    pass
+
+
+def generate_csv(path: Path, rows: int, equipment: int, invalid_fraction: float, seed: int) -> None:
+    """Write ``rows`` synthetic readings from ``equipment`` units, ``invalid_fraction`` unparsable."""
+    rng = np.random.default_rng(seed)
+    types = np.array(EQUIPMENT_TYPES)
+    with open(path, "w", newline="") as handle:
+        handle.write(",".join(REQUIRED_COLUMNS) + "\n")
+        for start in range(0, rows, GENERATE_BATCH_ROWS):
+            count = min(GENERATE_BATCH_ROWS, rows - start)
+            units = rng.integers(0, equipment, count)
+            frame = pd.DataFrame({
+                "Equipment Name": "Unit-" + pd.Series(units).astype(str),
+                "Type": types[units % len(types)],
+                "Flowrate": rng.gamma(4.0, 30.0, count).round(2).astype(str),
+                "Pressure": rng.normal(5.0, 1.5, count).round(2),
+                "Temperature": rng.normal(90.0, 25.0, count).round(1),
+            })
+            invalid = rng.random(count) < invalid_fraction
+            frame.loc[invalid, "Flowrate"] = "n/a"
+            frame.to_csv(handle, header=False, index=False)
+
+
+def measure(function, repeat: int, profile_memory: bool) -> tuple:
+    """Run ``function`` ``repeat`` times; return its stats and the last result."""
+    runs, peak, result = [], None, None
+    for _ in range(repeat):
+        if profile_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        result = function()
+        runs.append(time.perf_counter() - started)
+        if profile_memory:
+            peak = max(peak or 0, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+    stats = {"seconds": min(runs), "median_seconds": statistics.median(runs), "runs": runs}
+    if peak is not None:
+        stats["peak_bytes"] = peak
+    return stats, result
+
+
+class Command(BaseCommand):
+    help = "Benchmarks CSV ingestion, summaries, serialization, history and PDF reports"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma-separated row counts (default %(default)s)")
+        parser.add_argument("--repeat", type=int, default=3, help="Runs per stage; the fastest is reported")
+        parser.add_argument("--output", help="Write the JSON results to this file instead of stdout")
+        parser.add_argument("--equipment", type=int, default=1000, help="Distinct units in the generated data")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--invalid-fraction", type=float, default=0.01)
+        parser.add_argument(
+            "--serialize-limit",
+            type=int,
+            default=1_000_000,
+            help="Skip full-row serialization above this many rows (default %(default)s)",
+        )
+        parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc (it slows stages down)")
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options["sizes"].split(",") if size.strip()]
+        except ValueError:
+            raise CommandError("--sizes must be comma-separated integers")
+        if options["repeat"] < 1 or options["equipment"] < 1:
+            raise CommandError("--repeat and --equipment must be at least 1")
+
+        workdir = Path(tempfile.mkdtemp(prefix="chemviz-bench-"))
+        results = []
+        try:
+            with override_settings(MEDIA_ROOT=str(workdir / "media"), DATASET_HISTORY_LIMIT=sys.maxsize):
+                for rows in sizes:
+                    results.append(self.run_size(rows, workdir, options))
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        report = {
+            "generated_at": timezone.now().isoformat(),
+            "environment": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpus": os.cpu_count(),
+                "django": django.get_version(),
+                "numpy": np.__version__,
+                "pandas": pd.__version__,
+                "database": connection.vendor,
+                "csv_chunk_size": settings.CSV_CHUNK_SIZE,
+                "parallel_threshold": settings.INGEST_PARALLEL_THRESHOLD,
+                "parallel_workers": settings.INGEST_PARALLEL_WORKERS,
+            },
+            "options": {key: options[key] for key in ("repeat", "equipment", "seed", "invalid_fraction", "no_memory")},
+            "results": results,
+        }
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            Path(options["output"]).write_text(output + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Wrote benchmark results to {options['output']}"))
+        else:
+            self.stdout.write(output)
+
+    def run_size(self, rows: int, workdir: Path, options) -> dict:
+        repeat, profile_memory = options["repeat"], not options["no_memory"]
+        path = workdir / f"equipment-{rows}.csv"
+        self.stderr.write(f"Benchmarking {rows} rows...")
+
+        stages = {}
+        stages["generate"], _ = measure(
+            lambda: generate_csv(path, rows, options["equipment"], options["invalid_fraction"], options["seed"]), 1, False
+        )
+        result = {"rows": rows, "file_bytes": path.stat().st_size, "stages": stages}
+
+        try:
+            with transaction.atomic():
+                def ingest():
+                    with open(path, "rb") as handle:
+                        return create_dataset(File(handle, name=path.name), path.name)
+
+                stages["ingest"], dataset = measure(ingest, repeat, profile_memory)
+                stages["ingest"]["rows_per_second"] = rows / stages["ingest"]["seconds"]
+                stages["ingest"]["bytes_per_second"] = result["file_bytes"] / stages["ingest"]["seconds"]
+
+                # The in-memory path: one DataFrame of every clean row.
+                frame = open_store(dataset).read()
+                stages["summary"], _ = measure(
+                    lambda: _build_summary(frame, rows, rows - len(frame)), repeat, profile_memory
+                )
+                del frame
+
+                if dataset.row_count <= options["serialize_limit"]:
+                    stages["serialize"], payload = measure(
+                        lambda: JSONRenderer().render(DatasetDetailSerializer(dataset).data),
+                        repeat,
+                        profile_memory,
+                    )
+                    stages["serialize"]["response_bytes"] = len(payload)
+                    stages["stream"], streamed = measure(
+                        lambda: sum(len(chunk) for chunk in detail_chunks(dataset)), repeat, profile_memory
+                    )
+                    stages["stream"]["response_bytes"] = streamed
+                else:
+                    stages["serialize"] = {"skipped": f"more than {options['serialize_limit']} rows"}
+
+                user = User.objects.create_user(username=f"benchmark-{rows}")
+                factory = APIRequestFactory()
+
+                def history():
+                    request = factory.get("/api/history/")
+                    force_authenticate(request, user=user)
+                    return History.as_view()(request).render()
+
+                stages["history"], _ = measure(history, repeat, profile_memory)
+                stages["report"], pdf = measure(lambda: render_report(dataset), repeat, profile_memory)
+                stages["report"]["pdf_bytes"] = len(pdf)
+                raise Rollback
+        except Rollback:
+            pass
+        finally:
+            path.unlink(missing_ok=True)
+        return result
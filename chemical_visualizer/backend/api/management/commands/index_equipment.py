@@ -0,0 +1,19 @@
+"""
+Management command to rebuild the equipment index of every stored dataset,
+e.g. for datasets uploaded before the index existed.
+Usage: python manage.py index_equipment
+"""
+from django.core.management.base import BaseCommand
+
+from api.equipment import index_dataset
+from api.models import Dataset
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the per-equipment statistics used by /api/equipment/"
+
+    def handle(self, *args, **options):
+        for dataset in Dataset.objects.defer("data").order_by("uploaded_at"):
+            count = index_dataset(dataset)
+            self.stdout.write(f"{dataset.name} (#{dataset.pk}): {count} equipment")
+        self.stdout.write(self.style.SUCCESS("Equipment index rebuilt."))
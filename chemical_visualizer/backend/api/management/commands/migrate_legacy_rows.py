@@ -0,0 +1,19 @@
+"""
+Management command to convert the JSON rows of datasets uploaded before
+columnar storage, instead of converting each one on its first read.
+Usage: python manage.py migrate_legacy_rows
+"""
+from django.core.management.base import BaseCommand
+
+from api.models import Dataset
+from api.storage import open_store
+
+
+class Command(BaseCommand):
+    help = "Moves the rows of legacy datasets into the columnar store"
+
+    def handle(self, *args, **options):
+        for dataset in Dataset.objects.filter(storage_path="").order_by("uploaded_at"):
+            store = open_store(dataset)
+            self.stdout.write(f"{dataset.name} (#{dataset.pk}): {store.row_count} rows")
+        self.stdout.write(self.style.SUCCESS("Legacy datasets converted."))
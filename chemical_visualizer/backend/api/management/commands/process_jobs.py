@@ -0,0 +1,36 @@
+"""
+Management command to run queued ingestion jobs in a separate worker process,
+adding ingestion capacity outside the web server processes.
+Usage: python manage.py process_jobs [--once] [--interval SECONDS]
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from api.jobs import recover_jobs, run_queued_jobs
+from api.resumable import expire_sessions
+
+
+class Command(BaseCommand):
+    help = "Runs queued ingestion jobs, requeueing ones whose worker died and expiring idle uploads"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Exit once the queue is empty")
+        parser.add_argument("--interval", type=float, default=2.0, help="Seconds between polls of an empty queue")
+
+    def handle(self, *args, **options):
+        while True:
+            close_old_connections()
+            requeued = recover_jobs()
+            if requeued:
+                self.stdout.write(f"Requeued {requeued} interrupted job(s).")
+            expired = expire_sessions()
+            if expired:
+                self.stdout.write(f"Expired {expired} idle upload(s).")
+            ran = run_queued_jobs()
+            if ran:
+                self.stdout.write(f"Ran {ran} job(s).")
+            if options["once"]:
+                break
+            time.sleep(options["interval"])
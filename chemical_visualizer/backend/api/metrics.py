@@ -0,0 +1,255 @@
+"""Per-request timing spans and process-local metrics.
+
+``span("stage")`` times a block of code against the trace of the request
+being handled, which lives in a context variable set by ``TimingMiddleware``.
+Repeated spans (one per CSV chunk, say) add up. Outside a traced request
+``span`` returns a shared no-op context manager, and with
+``INSTRUMENTATION_ENABLED`` off the middleware removes itself, so disabled
+instrumentation costs one ``ContextVar.get`` per span.
+
+Each traced request gets a ``Server-Timing`` header and one JSON line on the
+``api.metrics`` logger, and is folded into ``REGISTRY``, which
+``/api/metrics/`` serves in the Prometheus text format. Background ingest
+jobs are traced with ``traced()`` and reported the same way.
+
+Scrapers authenticate with ``Authorization: Bearer <METRICS_TOKEN>`` instead
+of a user's credentials; see ``MetricsScrapePermission``.
+"""
+import contextvars
+import hmac
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from rest_framework.permissions import BasePermission
+
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class MetricsScrapePermission(BasePermission):
+    """Admits a bearer of ``METRICS_TOKEN``, or a signed-in user."""
+
+    def has_permission(self, request, view):
+        token = settings.METRICS_TOKEN
+        scheme, _, credentials = request.META.get("HTTP_AUTHORIZATION", "").partition(" ")
+        if token and scheme.lower() == "bearer" and hmac.compare_digest(credentials.encode(), token.encode()):
+            return True
+        return bool(request.user and request.user.is_authenticated)
+
+METRICS = {
+    "chemviz_requests_total": ("counter", "Requests handled, by route, method and status."),
+    "chemviz_request_duration_seconds": ("histogram", "Time to handle a request, by route."),
+    "chemviz_stage_duration_seconds": ("histogram", "Time spent in each instrumented stage, by route."),
+    "chemviz_rows_processed_total": ("counter", "CSV rows parsed or dataset rows serialized, by route."),
+    "chemviz_bytes_processed_total": ("counter", "Request and response body bytes, by route and direction."),
+    "chemviz_rows_per_second": ("gauge", "Rows per second of the most recent request that processed rows."),
+}
+
+_NOOP = nullcontext()
+_current = contextvars.ContextVar("chemviz_trace", default=None)
+
+
+class Trace:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans = {}
+        self.counts = {}
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+
+class _Span:
+    __slots__ = ("trace", "name", "started")
+
+    def __init__(self, trace: Trace, name: str):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        spans = self.trace.spans
+        spans[self.name] = spans.get(self.name, 0.0) + time.perf_counter() - self.started
+
+
+def span(name: str):
+    trace = _current.get()
+    if trace is None:
+        return _NOOP
+    return _Span(trace, name)
+
+
+def count(name: str, value: int) -> None:
+    """Add ``value`` to counter ``name`` (``rows``, ``bytes_in``, ...) of the current trace."""
+    trace = _current.get()
+    if trace is not None:
+        trace.counts[name] = trace.counts.get(name, 0) + value
+
+
+class Histogram:
+    def __init__(self, buckets=DURATION_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+class Registry:
+    """Counters, gauges and histograms keyed by ``(name, labels)``."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.values = {}
+        self.histograms = {}
+
+    def record(self, route: str, method: str, status: int, trace: Trace, elapsed: float) -> None:
+        route_label = (("route", route),)
+        rows = trace.counts.get("rows", 0)
+        with self.lock:
+            self._add("chemviz_requests_total", (*route_label, ("method", method), ("status", str(status))), 1)
+            self._observe("chemviz_request_duration_seconds", route_label, elapsed)
+            for stage, seconds in trace.spans.items():
+                self._observe("chemviz_stage_duration_seconds", (*route_label, ("stage", stage)), seconds)
+            if rows:
+                self._add("chemviz_rows_processed_total", route_label, rows)
+                if elapsed > 0:
+                    self.values[("chemviz_rows_per_second", route_label)] = rows / elapsed
+            for direction in ("in", "out"):
+                transferred = trace.counts.get(f"bytes_{direction}", 0)
+                if transferred:
+                    self._add("chemviz_bytes_processed_total", (*route_label, ("direction", direction)), transferred)
+
+    def _add(self, name: str, labels: tuple, value: float) -> None:
+        key = (name, labels)
+        self.values[key] = self.values.get(key, 0) + value
+
+    def _observe(self, name: str, labels: tuple, value: float) -> None:
+        key = (name, labels)
+        if key not in self.histograms:
+            self.histograms[key] = Histogram()
+        self.histograms[key].observe(value)
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        with self.lock:
+            values = sorted(self.values.items())
+            histograms = sorted(
+                (key, list(histogram.counts), histogram.sum, histogram.buckets)
+                for key, histogram in self.histograms.items()
+            )
+
+        lines = []
+        for name, (kind, description) in METRICS.items():
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            for (metric, labels), value in values:
+                if metric == name:
+                    lines.append(f"{name}{_labels(labels)} {value:g}")
+            for (metric, labels), counts, total, buckets in histograms:
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, bucket_count in zip((*buckets, "+Inf"), counts):
+                    cumulative += bucket_count
+                    lines.append(f"{name}_bucket{_labels((*labels, ('le', bound)))} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labels)} {total:g}")
+                lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def _report(trace: Trace, route: str, method: str, status: int) -> float:
+    elapsed = trace.elapsed()
+    REGISTRY.record(route, method, status, trace, elapsed)
+    logger.info(json.dumps({
+        "event": "request",
+        "route": route,
+        "method": method,
+        "status": status,
+        "duration_ms": round(elapsed * 1000, 3),
+        "spans_ms": {name: round(seconds * 1000, 3) for name, seconds in trace.spans.items()},
+        "counts": trace.counts,
+    }))
+    return elapsed
+
+
+def server_timing(trace: Trace, elapsed: float) -> str:
+    entries = [f"{name};dur={seconds * 1000:.3f}" for name, seconds in trace.spans.items()]
+    entries.append(f"total;dur={elapsed * 1000:.3f}")
+    return ", ".join(entries)
+
+
+@contextmanager
+def traced(route: str):
+    """Trace work done outside a request, such as a background ingest job.
+
+    Inside a request that is already traced, spans go to that request.
+    """
+    if not settings.INSTRUMENTATION_ENABLED or _current.get() is not None:
+        yield
+        return
+    trace = Trace()
+    token = _current.set(trace)
+    status = 200
+    try:
+        yield
+    except Exception:
+        status = 500
+        raise
+    finally:
+        _current.reset(token)
+        _report(trace, route, "JOB", status)
+
+
+class TimingMiddleware:
+    def __init__(self, get_response):
+        if not settings.INSTRUMENTATION_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        trace = Trace()
+        trace.counts["bytes_in"] = int(request.META.get("CONTENT_LENGTH") or 0)
+        token = _current.set(trace)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+
+        if response.streaming:
+            trace.counts["bytes_out"] = int(response.get("Content-Length") or 0)
+        else:
+            trace.counts["bytes_out"] = len(response.content)
+        match = request.resolver_match
+        route = match.route if match is not None else "unmatched"
+        elapsed = _report(trace, route, request.method, response.status_code)
+        response["Server-Timing"] = server_timing(trace, elapsed)
+        return response
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-18 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0002_dataset_data_columns_row_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dataset",
+            name="storage_path",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="dataset",
+            name="schema",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-18 18:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_ingestjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataset',
+            name='stats',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-18 19:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_dataset_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataset',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='ingestjob',
+            name='content_hash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
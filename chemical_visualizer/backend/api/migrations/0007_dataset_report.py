@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-18 20:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataset',
+            name='report',
+            field=models.FileField(blank=True, upload_to='reports/'),
+        ),
+        migrations.AddField(
+            model_name='dataset',
+            name='report_version',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+    ]
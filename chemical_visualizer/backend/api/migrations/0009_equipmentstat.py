@@ -0,0 +1,36 @@
+# Generated by Django 6.0.1 on 2026-10-18 21:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_dataset_uploaded_at_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EquipmentStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('equipment_name', models.CharField(max_length=255)),
+                ('type', models.CharField(max_length=100)),
+                ('count', models.PositiveIntegerField()),
+                ('flowrate_mean', models.FloatField()),
+                ('flowrate_min', models.FloatField()),
+                ('flowrate_max', models.FloatField()),
+                ('pressure_mean', models.FloatField()),
+                ('pressure_min', models.FloatField()),
+                ('pressure_max', models.FloatField()),
+                ('temperature_mean', models.FloatField()),
+                ('temperature_min', models.FloatField()),
+                ('temperature_max', models.FloatField()),
+                ('dataset', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='equipment_stats', to='api.dataset')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['equipment_name', 'type'], name='api_equipme_equipme_9a3be9_idx')],
+            },
+        ),
+    ]
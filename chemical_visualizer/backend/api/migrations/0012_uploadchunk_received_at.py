@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:05
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_ingestjob_attempts_heartbeat'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadchunk',
+            name='received_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
@@ -1,3 +1,5 @@
+import uuid
+
 from django.db import models
 
 
@@ -13,9 +15,161 @@ class Dataset(models.Model):
 
     data = models.JSONField(default=list)
 
-    uploaded_at = models.DateTimeField(auto_now_add=True)
+    storage_path = models.CharField(max_length=255, blank=True)
+
+    schema = models.JSONField(default=dict, blank=True)
+
+    uploaded_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
     summary = models.JSONField()
 
+    stats = models.JSONField(default=dict, blank=True)
+
+    content_hash = models.CharField(max_length=64, blank=True, db_index=True)
+
+    report = models.FileField(upload_to='reports/', blank=True)
+
+    report_version = models.PositiveSmallIntegerField(default=0)
+
     def __str__(self):
         return self.name
+
+
+class IngestJob(models.Model):
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (SUCCEEDED, "Succeeded"),
+        (FAILED, "Failed"),
+    ]
+    ACTIVE_STATUSES = (QUEUED, RUNNING)
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    name = models.CharField(max_length=200)
+
+    staged_path = models.CharField(max_length=255, blank=True)
+
+    content_hash = models.CharField(max_length=64, blank=True)
+
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=QUEUED)
+
+    size = models.PositiveBigIntegerField(default=0)
+
+    bytes_processed = models.PositiveBigIntegerField(default=0)
+
+    rows_processed = models.PositiveBigIntegerField(default=0)
+
+    error = models.JSONField(null=True, blank=True)
+
+    attempts = models.PositiveSmallIntegerField(default=0)
+
+    # Touched by the worker while the job runs; see ``jobs.recover_jobs``.
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+
+    dataset = models.ForeignKey(Dataset, null=True, blank=True, on_delete=models.SET_NULL, related_name="+")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    @property
+    def progress(self) -> float:
+        if self.status == self.SUCCEEDED:
+            return 1.0
+        return min(self.bytes_processed / self.size, 1.0) if self.size else 0.0
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
+
+
+class UploadSession(models.Model):
+    """A resumable upload whose chunks are written into one staged file."""
+
+    UPLOADING = "uploading"
+    COMPLETE = "complete"
+    STATUS_CHOICES = [
+        (UPLOADING, "Uploading"),
+        (COMPLETE, "Complete"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    name = models.CharField(max_length=200)
+
+    size = models.PositiveBigIntegerField()
+
+    chunk_size = models.PositiveIntegerField()
+
+    staged_path = models.CharField(max_length=255)
+
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=UPLOADING)
+
+    content_hash = models.CharField(max_length=64, blank=True)
+
+    job = models.ForeignKey(IngestJob, null=True, blank=True, on_delete=models.SET_NULL, related_name="+")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    @property
+    def chunk_count(self) -> int:
+        return -(-self.size // self.chunk_size)
+
+    def chunk_length(self, index: int) -> int:
+        return min(self.chunk_size, self.size - index * self.chunk_size)
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
+
+
+class UploadChunk(models.Model):
+
+    session = models.ForeignKey(UploadSession, on_delete=models.CASCADE, related_name="chunks")
+
+    index = models.PositiveIntegerField()
+
+    received_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["session", "index"], name="unique_upload_chunk")]
+
+
+class EquipmentStat(models.Model):
+    """Per-dataset readings of one piece of equipment, aggregated at ingestion."""
+
+    dataset = models.ForeignKey(Dataset, on_delete=models.CASCADE, related_name="equipment_stats")
+
+    equipment_name = models.CharField(max_length=255)
+
+    type = models.CharField(max_length=100)
+
+    count = models.PositiveIntegerField()
+
+    flowrate_mean = models.FloatField()
+
+    flowrate_min = models.FloatField()
+
+    flowrate_max = models.FloatField()
+
+    pressure_mean = models.FloatField()
+
+    pressure_min = models.FloatField()
+
+    pressure_max = models.FloatField()
+
+    temperature_mean = models.FloatField()
+
+    temperature_min = models.FloatField()
+
+    temperature_max = models.FloatField()
+
+    class Meta:
+        indexes = [models.Index(fields=["equipment_name", "type"])]
+
+    def __str__(self):
+        return f"{self.equipment_name} ({self.type})"
@@ -0,0 +1,14 @@
+from rest_framework.pagination import LimitOffsetPagination
+
+
+class DatasetRowsPagination(LimitOffsetPagination):
+    default_limit = 100
+    max_limit = 5000
+
+    def paginate_columns(self, rows, request) -> dict:
+        """Like ``paginate_queryset``, but return the page as ``{column: [values]}``."""
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.count = self.get_count(rows)
+        self.offset = self.get_offset(request)
+        return rows.column_lists(slice(self.offset, self.offset + self.limit))
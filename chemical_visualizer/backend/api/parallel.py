@@ -0,0 +1,163 @@
+"""Parallel parsing of large CSV files that are already on local disk.
+
+The body of the file is cut into byte ranges on line boundaries. Each range is
+parsed in a worker process with the header line prepended, and returns its
+cleaned rows and a partial ``SummaryAccumulator``. The parent merges the
+results in file order. Only ``INGEST_PARALLEL_WORKERS * 2`` ranges are in
+flight at once, so memory stays bounded by the range size, not the file size.
+
+A quoted field may contain a newline, so a range can start mid-record. Every
+range reports how many quote characters it holds; if a range ends with an odd
+running total, it was cut inside a quoted field. That, or a range that fails
+to parse, raises ``UnsplittableCSVError`` and the caller parses the file
+serially instead.
+"""
+import io
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from django.conf import settings
+
+from .columns import REQUIRED_COLUMNS
+from .ingest import InvalidCSVError, MissingColumnsError, iter_chunks, read_header
+from .summary import SummaryAccumulator
+from .validation import Validator
+
+
+# Files with quotes near the top are likely to quote fields throughout, and
+# are parsed serially without trying ranges first.
+QUOTE_SNIFF_BYTES = 1 << 20
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+class UnsplittableCSVError(InvalidCSVError):
+    """The file cannot be parsed as independent byte ranges."""
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Never fork: the server process may already be running threads.
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            _pool = ProcessPoolExecutor(max_workers=settings.INGEST_PARALLEL_WORKERS, mp_context=context)
+    return _pool
+
+
+def local_path(file):
+    """Return the on-disk path behind an uploaded or opened file, if any."""
+    if hasattr(file, "temporary_file_path"):
+        return file.temporary_file_path()
+    name = getattr(getattr(file, "file", file), "name", None)
+    # Archive members carry a relative member name, not a path.
+    if isinstance(name, str) and os.path.isabs(name) and os.path.isfile(name):
+        return name
+    return None
+
+
+def should_parallelize(path) -> bool:
+    if not path or settings.INGEST_PARALLEL_WORKERS < 2:
+        return False
+    if os.path.getsize(path) < settings.INGEST_PARALLEL_THRESHOLD:
+        return False
+    with open(path, "rb") as handle:
+        return b'"' not in handle.read(QUOTE_SNIFF_BYTES)
+
+
+def split_ranges(path, range_bytes: int) -> tuple:
+    """Return the header line and ``(start, end)`` byte ranges of the body."""
+    size = os.path.getsize(path)
+    with open(path, "rb") as handle:
+        header = handle.readline()
+        boundaries = [handle.tell()]
+        while boundaries[-1] < size:
+            handle.seek(min(boundaries[-1] + range_bytes, size))
+            handle.readline()
+            boundaries.append(min(handle.tell(), size))
+    return header, list(zip(boundaries, boundaries[1:]))
+
+
+def parse_range(path, header: bytes, start: int, end: int, chunk_size: int, validation: dict):
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        body = handle.read(end - start)
+
+    # Duplicate names span ranges, so the parent flags them in file order.
+    validator = Validator(validation)
+    stats = SummaryAccumulator()
+    frames = []
+    for chunk in iter_chunks(io.BytesIO(header + body), chunk_size):
+        stats.observe_raw(len(chunk))
+        cleaned = validator.validate(chunk, duplicates=False)
+        stats.update(cleaned)
+        frames.append(cleaned)
+    # The index (row number within the range) is kept for the error report.
+    cleaned = pd.concat(frames) if frames else pd.DataFrame(columns=REQUIRED_COLUMNS)
+    return cleaned, stats, validator.report, body.count(b'"')
+
+
+def ingest_csv_parallel(path, sink=None, on_progress=None, validator=None) -> SummaryAccumulator:
+    """Parallel counterpart of ``ingest_csv`` for a file at ``path``.
+
+    Raises ``UnsplittableCSVError`` if the ranges cannot be parsed on their
+    own. ``sink`` may already have received rows by then, so callers discard
+    its output and parse the file serially.
+    """
+    with open(path, "rb") as handle:
+        missing = [col for col in REQUIRED_COLUMNS if col not in read_header(handle)]
+    if missing:
+        raise MissingColumnsError(missing)
+
+    validator = validator or Validator(settings.DATASET_VALIDATION)
+    header, ranges = split_ranges(path, settings.INGEST_PARALLEL_RANGE_BYTES)
+    pool = _get_pool()
+    window = settings.INGEST_PARALLEL_WORKERS * 2
+    remaining = iter(ranges)
+    pending = deque()
+
+    def submit_next():
+        next_range = next(remaining, None)
+        if next_range is not None:
+            start, end = next_range
+            future = pool.submit(
+                parse_range, path, header, start, end, settings.CSV_CHUNK_SIZE, validator.config
+            )
+            pending.append((end, future))
+
+    for _ in range(window):
+        submit_next()
+
+    stats = SummaryAccumulator()
+    quotes = header.count(b'"')
+    try:
+        while pending:
+            end, future = pending.popleft()
+            try:
+                cleaned, partial, report, range_quotes = future.result()
+            except ValueError as exc:
+                # Tokenizer errors and column count mismatches; pandas may
+                # raise them before ``iter_chunks`` wraps them.
+                raise UnsplittableCSVError() from exc
+            quotes += range_quotes
+            if quotes % 2:
+                raise UnsplittableCSVError()
+            submit_next()
+            offset = stats.raw_count
+            validator.report.merge(report, offset)
+            validator.flag_duplicates(cleaned, offset)
+            stats.merge(partial)
+            if sink is not None:
+                sink(cleaned)
+            if on_progress is not None:
+                on_progress(stats.raw_count, end)
+    finally:
+        for _, future in pending:
+            future.cancel()
+    return stats
@@ -0,0 +1,59 @@
+"""Compact representations of dataset payloads, picked by content negotiation.
+
+``columnar`` JSON sends rows as one array per column, so the payload no longer
+repeats every column name once per row and clients can turn each array into a
+typed buffer directly. MessagePack carries the same columnar layout in binary
+when the optional ``msgpack`` package is installed.
+"""
+import json
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.settings import api_settings
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    media_type = "application/vnd.chemviz.columnar+json"
+    format = "columnar"
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=str)
+
+
+class PrometheusRenderer(BaseRenderer):
+    """Plain text for ``/api/metrics/``; error payloads are rendered as JSON."""
+
+    media_type = "text/plain"
+    format = "prometheus"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, str):
+            return data.encode(self.charset)
+        return json.dumps(data).encode(self.charset)
+
+
+# Renderer formats whose payloads carry rows column by column.
+COLUMNAR_FORMATS = {ColumnarJSONRenderer.format, MessagePackRenderer.format}
+
+DATASET_RENDERERS = [*api_settings.DEFAULT_RENDERER_CLASSES, ColumnarJSONRenderer]
+if msgpack is not None:
+    DATASET_RENDERERS.append(MessagePackRenderer)
+
+
+def data_layout(request) -> str:
+    renderer = getattr(request, "accepted_renderer", None)
+    return "columns" if getattr(renderer, "format", None) in COLUMNAR_FORMATS else "records"
@@ -0,0 +1,108 @@
+import io
+import os
+import uuid
+from pathlib import Path
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import inch
+from reportlab.pdfgen import canvas
+
+from .metrics import span
+
+
+# Bump when the layout below changes so cached reports are re-rendered.
+REPORT_VERSION = 1
+
+
+def report_filename(dataset) -> str:
+    return f"dataset-report-{dataset.pk}.pdf"
+
+
+def render_report(dataset) -> bytes:
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter)
+
+    pdf.setTitle(f"Dataset Report - {dataset.name}")
+    pdf.setFont("Helvetica-Bold", 16)
+    pdf.drawString(1 * inch, 10.5 * inch, "Chemical Equipment Report")
+
+    pdf.setFont("Helvetica", 12)
+    pdf.drawString(1 * inch, 10.0 * inch, f"Dataset: {dataset.name}")
+    pdf.drawString(1 * inch, 9.7 * inch, f"Uploaded: {dataset.uploaded_at}")
+    pdf.drawString(1 * inch, 9.4 * inch, f"Total Records: {dataset.row_count}")
+
+    summary = dataset.summary or {}
+    pdf.drawString(
+        1 * inch,
+        8.9 * inch,
+        f"Average Flowrate: {summary.get('avg_flow', 0):.2f} (Min: {summary.get('min_flow', 0):.2f}, Max: {summary.get('max_flow', 0):.2f})",
+    )
+    pdf.drawString(
+        1 * inch,
+        8.6 * inch,
+        f"Average Pressure: {summary.get('avg_pressure', 0):.2f} (Min: {summary.get('min_pressure', 0):.2f}, Max: {summary.get('max_pressure', 0):.2f})",
+    )
+    pdf.drawString(
+        1 * inch,
+        8.3 * inch,
+        f"Average Temperature: {summary.get('avg_temp', 0):.2f} (Min: {summary.get('min_temp', 0):.2f}, Max: {summary.get('max_temp', 0):.2f})",
+    )
+    pdf.drawString(
+        1 * inch,
+        8.0 * inch,
+        f"Invalid Rows: {summary.get('invalid_rows', 0)} | Total Uploaded: {summary.get('total_raw', dataset.row_count)}",
+    )
+
+    pdf.setFont("Helvetica-Bold", 12)
+    pdf.drawString(1 * inch, 7.5 * inch, "Type Distribution")
+    pdf.setFont("Helvetica", 11)
+
+    y = 7.2 * inch
+    for equipment_type, count in (summary.get("type_dist") or {}).items():
+        pdf.drawString(1 * inch, y, f"{equipment_type}: {count}")
+        y -= 0.25 * inch
+        if y < 1.25 * inch:
+            pdf.showPage()
+            y = 10.5 * inch
+
+    pdf.showPage()
+    pdf.save()
+
+    return buffer.getvalue()
+
+
+def report_is_current(dataset) -> bool:
+    if not dataset.report or dataset.report_version != REPORT_VERSION:
+        return False
+    return dataset.report.storage.exists(dataset.report.name)
+
+
+def ensure_report(dataset):
+    """Return the stored report for ``dataset``, rendering it the first time.
+
+    Concurrent requests may both render it. Each writes a temporary file and
+    renames it over the same fixed path, so the last one wins and a reader
+    never sees a partial or deleted file.
+    """
+    if not report_is_current(dataset):
+        with span("render_pdf"):
+            content = render_report(dataset)
+        storage = dataset.report.storage
+        name = dataset.report.field.generate_filename(dataset, report_filename(dataset))
+        path = Path(storage.path(name))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f".{uuid.uuid4().hex}{path.suffix}")
+        try:
+            temporary.write_bytes(content)
+            os.replace(temporary, path)
+        finally:
+            temporary.unlink(missing_ok=True)
+
+        previous = dataset.report.name
+        dataset.report.name = name
+        dataset.report_version = REPORT_VERSION
+        dataset.save(update_fields=["report", "report_version"])
+        if previous and previous != name:
+            # Reports stored before their name was fixed.
+            storage.delete(previous)
+    return dataset.report
@@ -0,0 +1,243 @@
+"""Resumable chunked uploads.
+
+A client opens an ``UploadSession`` with the file's name and size. It then
+PUTs numbered chunks, in any order and in parallel, and each one is written
+at its offset in a staged file under ``MEDIA_ROOT/staging/``. Chunks already
+received are listed on the session, so an interrupted client only re-sends
+what is missing.
+
+The SHA-256 is computed while the chunks arrive: every process keeps a hasher
+per session and feeds it the contiguous prefix of received chunks. If the
+hasher is missing (a restart, or chunks spread over several processes), the
+rest of the file is hashed in one pass at completion. When the last chunk
+lands, the staged file is handed to a normal ``IngestJob``.
+
+Sessions that receive no chunk for ``UPLOAD_SESSION_TTL`` seconds are
+deleted by ``expire_sessions``, which new sessions and the ``process_jobs``
+command run. Deleting a session that is still uploading removes its staged
+file and hasher.
+"""
+import hashlib
+import threading
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Max
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .jobs import STAGING_DIR, enqueue
+from .models import IngestJob, UploadChunk, UploadSession
+from .storage import storage_root
+
+
+COPY_BLOCK_SIZE = 1 << 20
+EXPIRY_INTERVAL = 60
+
+
+class UploadError(ValueError):
+    def __init__(self, message, **details):
+        super().__init__(message)
+        self.details = details
+
+    @property
+    def payload(self) -> dict:
+        return {"error": str(self), **self.details}
+
+
+class _HashState:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.hasher = hashlib.sha256()
+        self.offset = 0
+
+
+_hash_states = {}
+_hash_states_lock = threading.Lock()
+_last_expiry = float("-inf")
+
+
+def _hash_state(session_id) -> _HashState:
+    with _hash_states_lock:
+        return _hash_states.setdefault(session_id, _HashState())
+
+
+def start_session(name: str, size: int) -> UploadSession:
+    if size <= 0:
+        raise UploadError("size must be a positive number of bytes")
+    _expire_periodically()
+    relative_path = f"{STAGING_DIR}/{uuid.uuid4().hex}.csv"
+    path = storage_root() / relative_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as handle:
+        handle.truncate(size)
+    return UploadSession.objects.create(
+        name=name,
+        size=size,
+        chunk_size=settings.UPLOAD_CHUNK_SIZE,
+        staged_path=relative_path,
+    )
+
+
+def received_chunks(session) -> list:
+    return sorted(session.chunks.values_list("index", flat=True))
+
+
+def missing_chunks(session, received=None) -> list:
+    received = set(received_chunks(session) if received is None else received)
+    return [index for index in range(session.chunk_count) if index not in received]
+
+
+def write_chunk(session, index: int, stream) -> None:
+    """Write chunk ``index`` from ``stream``; re-sent chunks are ignored."""
+    if session.status != UploadSession.UPLOADING:
+        raise UploadError("Upload is already complete")
+    if not 0 <= index < session.chunk_count:
+        raise UploadError("Chunk index out of range", chunk_count=session.chunk_count)
+    if session.chunks.filter(index=index).exists():
+        return
+
+    expected = session.chunk_length(index)
+    written = 0
+    with open(storage_root() / session.staged_path, "r+b") as handle:
+        handle.seek(index * session.chunk_size)
+        while written <= expected:
+            block = stream.read(min(COPY_BLOCK_SIZE, expected + 1 - written))
+            if not block:
+                break
+            handle.write(block[:expected - written])
+            written += len(block)
+    if written != expected:
+        raise UploadError(f"Chunk {index} must be {expected} bytes", received=written)
+
+    try:
+        UploadChunk.objects.create(session=session, index=index)
+    except IntegrityError:
+        # The same chunk was written concurrently; both copies are identical.
+        return
+    _advance_hash(session)
+
+
+def _read_range(session, start: int, stop: int):
+    with open(storage_root() / session.staged_path, "rb") as handle:
+        handle.seek(start)
+        while start < stop:
+            block = handle.read(min(COPY_BLOCK_SIZE, stop - start))
+            if not block:
+                return
+            start += len(block)
+            yield block
+
+
+def _advance_hash(session) -> None:
+    state = _hash_state(session.pk)
+    if not state.lock.acquire(blocking=False):
+        # Another thread is hashing this session. Whatever it misses is
+        # hashed by ``finish_digest`` at completion.
+        return
+    try:
+        received = set(received_chunks(session))
+        while state.offset < session.size and state.offset // session.chunk_size in received:
+            index = state.offset // session.chunk_size
+            end = index * session.chunk_size + session.chunk_length(index)
+            for block in _read_range(session, state.offset, end):
+                state.hasher.update(block)
+            state.offset = end
+    finally:
+        state.lock.release()
+
+
+def finish_digest(session) -> str:
+    with _hash_states_lock:
+        state = _hash_states.pop(session.pk, None) or _HashState()
+    with state.lock:
+        for block in _read_range(session, state.offset, session.size):
+            state.hasher.update(block)
+        return state.hasher.hexdigest()
+
+
+def complete_session(session):
+    """Queue the finished upload for ingestion; return its job.
+
+    Safe to call repeatedly or concurrently: only one caller creates the job.
+    The status change and the job are committed together, so a failure leaves
+    the session uploading and completion can be retried.
+    """
+    missing = missing_chunks(session)
+    if missing:
+        raise UploadError("Upload is incomplete", missing=missing)
+    if session.status != UploadSession.UPLOADING:
+        return session.job
+
+    # Hashed first, so the write transaction below stays short.
+    content_hash = finish_digest(session)
+    with transaction.atomic():
+        claimed = UploadSession.objects.filter(pk=session.pk, status=UploadSession.UPLOADING).update(
+            status=UploadSession.COMPLETE, content_hash=content_hash
+        )
+        if not claimed:
+            session.refresh_from_db(fields=["status", "job", "content_hash"])
+            return session.job
+        job = IngestJob.objects.create(
+            name=session.name,
+            staged_path=session.staged_path,
+            size=session.size,
+            content_hash=content_hash,
+        )
+        UploadSession.objects.filter(pk=session.pk).update(job=job)
+
+    session.status, session.content_hash, session.job = UploadSession.COMPLETE, content_hash, job
+    enqueue(job)
+    return job
+
+
+def abort_session(session) -> None:
+    # The staged file and hasher are removed by the post_delete signal.
+    session.delete()
+
+
+def discard_session_state(session) -> None:
+    """Drop the hasher of ``session`` and, unless a job owns it, its staged file."""
+    with _hash_states_lock:
+        _hash_states.pop(session.pk, None)
+    if session.status == UploadSession.UPLOADING:
+        (storage_root() / session.staged_path).unlink(missing_ok=True)
+
+
+def expire_sessions() -> int:
+    """Delete sessions idle for longer than ``UPLOAD_SESSION_TTL``; return how many.
+
+    Hashers left behind for sessions that no longer exist (deleted from
+    another process, say) are dropped too.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.UPLOAD_SESSION_TTL)
+    stale = UploadSession.objects.alias(
+        active_at=Coalesce(Max("chunks__received_at"), "created_at")
+    ).filter(active_at__lt=cutoff)
+    expired = 0
+    for session in stale:
+        session.delete()
+        expired += 1
+
+    with _hash_states_lock:
+        tracked = list(_hash_states)
+    uploading = set(
+        UploadSession.objects.filter(pk__in=tracked, status=UploadSession.UPLOADING).values_list("pk", flat=True)
+    )
+    with _hash_states_lock:
+        for session_id in tracked:
+            if session_id not in uploading:
+                _hash_states.pop(session_id, None)
+    return expired
+
+
+def _expire_periodically() -> None:
+    global _last_expiry
+    with _hash_states_lock:
+        if time.monotonic() - _last_expiry < EXPIRY_INTERVAL:
+            return
+        _last_expiry = time.monotonic()
+    expire_sessions()
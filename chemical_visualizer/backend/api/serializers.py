@@ -1,5 +1,7 @@
 from rest_framework import serializers
-from .models import Dataset
+from .models import Dataset, IngestJob, UploadSession
+from .resumable import missing_chunks, received_chunks
+from .storage import open_store
 
 
 class DatasetListSerializer(serializers.ModelSerializer):
@@ -11,6 +13,8 @@ class DatasetListSerializer(serializers.ModelSerializer):
 
 class DatasetDetailSerializer(serializers.ModelSerializer):
 
+    data = serializers.SerializerMethodField()
+
     class Meta:
         model = Dataset
         fields = (
@@ -22,3 +26,62 @@ class DatasetDetailSerializer(serializers.ModelSerializer):
             "data",
             "summary",
         )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if not self.context.get("include_data", True):
+            self.fields.pop("data")
+
+    def get_data(self, obj):
+        if self.context.get("layout") == "columns":
+            return open_store(obj).column_lists(obj.columns or None)
+        return open_store(obj).records(obj.columns or None)
+
+
+class IngestJobSerializer(serializers.ModelSerializer):
+
+    progress = serializers.ReadOnlyField()
+
+    class Meta:
+        model = IngestJob
+        fields = (
+            "id",
+            "name",
+            "status",
+            "progress",
+            "size",
+            "bytes_processed",
+            "rows_processed",
+            "error",
+            "dataset",
+            "created_at",
+            "finished_at",
+        )
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+
+    chunk_count = serializers.ReadOnlyField()
+    received = serializers.SerializerMethodField()
+    missing = serializers.SerializerMethodField()
+
+    class Meta:
+        model = UploadSession
+        fields = (
+            "id",
+            "name",
+            "size",
+            "chunk_size",
+            "chunk_count",
+            "received",
+            "missing",
+            "status",
+            "job",
+            "created_at",
+        )
+
+    def get_received(self, obj):
+        return received_chunks(obj)
+
+    def get_missing(self, obj):
+        return missing_chunks(obj)
@@ -0,0 +1,26 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .caching import invalidate_dataset
+from .models import Dataset, UploadSession
+from .resumable import discard_session_state
+from .storage import delete_store
+
+
+@receiver(post_delete, sender=Dataset)
+def remove_dataset_artifacts(sender, instance, **kwargs):
+    delete_store(instance.storage_path)
+    for field_file in (instance.file, instance.report):
+        if field_file:
+            field_file.delete(save=False)
+
+
+@receiver(post_save, sender=Dataset)
+@receiver(post_delete, sender=Dataset)
+def invalidate_cached_dataset(sender, instance, **kwargs):
+    invalidate_dataset(instance)
+
+
+@receiver(post_delete, sender=UploadSession)
+def remove_upload_session_artifacts(sender, instance, **kwargs):
+    discard_session_state(instance)
@@ -0,0 +1,282 @@
+"""Columnar on-disk storage for cleaned dataset rows.
+
+Each dataset gets a directory under ``MEDIA_ROOT/datasets/`` holding one
+little-endian binary file per column. Numeric columns are raw float64 and
+text columns are int32 dictionary codes (``-1`` for missing values) next to a
+JSON dictionary file. Every file is read back through ``numpy.memmap``, so
+slicing rows or columns only touches the pages that are actually needed.
+"""
+import json
+import shutil
+import uuid
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+
+from .columns import NUMERIC_COLUMNS, REQUIRED_COLUMNS
+from .models import Dataset
+
+
+STORAGE_DIR = "datasets"
+SCHEMA_VERSION = 1
+
+FLOAT_DTYPE = np.dtype("<f8")
+CODE_DTYPE = np.dtype("<i4")
+
+
+def _file_stem(column: str) -> str:
+    return column.lower().replace(" ", "_")
+
+
+def storage_root() -> Path:
+    return Path(settings.MEDIA_ROOT)
+
+
+class ColumnarWriter:
+    """Appends cleaned chunks to a new store; use as a context manager.
+
+    Leaving the ``with`` block normally finalises the store and fills in
+    ``schema``; leaving it through an exception removes the partial files.
+    """
+
+    def __init__(self, columns=None):
+        self.columns = list(columns or REQUIRED_COLUMNS)
+        self.relative_path = f"{STORAGE_DIR}/{uuid.uuid4().hex}"
+        self.path = storage_root() / self.relative_path
+        self.rows = 0
+        self.schema = None
+        self._handles = {}
+        self._dictionaries = {
+            column: {} for column in self.columns if column not in NUMERIC_COLUMNS
+        }
+
+    def __enter__(self):
+        self.path.mkdir(parents=True)
+        for column in self.columns:
+            self._handles[column] = open(self.path / f"{_file_stem(column)}.bin", "wb")
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+    def append(self, df: pd.DataFrame) -> None:
+        for column, handle in self._handles.items():
+            if column in NUMERIC_COLUMNS:
+                values = df[column].to_numpy(dtype=FLOAT_DTYPE)
+            else:
+                values = self._encode(column, df[column])
+            handle.write(values.tobytes())
+        self.rows += int(len(df))
+
+    def _encode(self, column: str, series: pd.Series) -> np.ndarray:
+        codes, uniques = pd.factorize(series)
+        lookup = self._dictionaries[column]
+        remap = np.fromiter(
+            (lookup.setdefault(value, len(lookup)) for value in uniques),
+            dtype=CODE_DTYPE,
+            count=len(uniques),
+        )
+        encoded = np.full(len(codes), -1, dtype=CODE_DTYPE)
+        present = codes >= 0
+        encoded[present] = remap[codes[present]]
+        return encoded
+
+    def close(self) -> dict:
+        for handle in self._handles.values():
+            handle.close()
+        specs = []
+        for column in self.columns:
+            stem = _file_stem(column)
+            spec = {"name": column, "file": f"{stem}.bin"}
+            if column in NUMERIC_COLUMNS:
+                spec["dtype"] = "float64"
+            else:
+                spec["dtype"] = "dictionary"
+                spec["dictionary"] = f"{stem}.dict.json"
+                with open(self.path / spec["dictionary"], "w", encoding="utf-8") as handle:
+                    json.dump(list(self._dictionaries[column]), handle)
+            specs.append(spec)
+        self.schema = {"version": SCHEMA_VERSION, "rows": self.rows, "columns": specs}
+        return self.schema
+
+    def abort(self) -> None:
+        for handle in self._handles.values():
+            handle.close()
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+@lru_cache(maxsize=64)
+def _load_dictionary(path: str) -> np.ndarray:
+    with open(path, encoding="utf-8") as handle:
+        values = json.load(handle)
+    # The trailing None is what a ``-1`` code decodes to.
+    dictionary = np.empty(len(values) + 1, dtype=object)
+    dictionary[:-1] = values
+    return dictionary
+
+
+class ColumnarStore:
+    def __init__(self, path, schema: dict):
+        self.path = Path(path)
+        self.schema = schema
+        self.row_count = int(schema.get("rows", 0))
+        self._specs = {spec["name"]: spec for spec in schema.get("columns", [])}
+        self.columns = list(self._specs)
+
+    def is_dictionary(self, column: str) -> bool:
+        return self._specs[column]["dtype"] == "dictionary"
+
+    def raw(self, column: str) -> np.ndarray:
+        """Return the memory-mapped float64 values or int32 codes of ``column``."""
+        spec = self._specs[column]
+        dtype = CODE_DTYPE if self.is_dictionary(column) else FLOAT_DTYPE
+        if self.row_count == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(self.path / spec["file"], dtype=dtype, mode="r", shape=(self.row_count,))
+
+    def dictionary(self, column: str) -> np.ndarray:
+        return _load_dictionary(str(self.path / self._specs[column]["dictionary"]))
+
+    def column(self, column: str, rows=slice(None)) -> np.ndarray:
+        values = self.raw(column)[rows]
+        if self.is_dictionary(column):
+            return self.dictionary(column)[values]
+        return values
+
+    def read(self, columns=None, start=0, stop=None, rows=None) -> pd.DataFrame:
+        """Materialise ``columns`` for a row range (or an index array) only."""
+        columns = list(columns or self.columns)
+        selector = slice(start, stop) if rows is None else rows
+        data = {column: self.column(column, selector) for column in columns}
+        return pd.DataFrame(data, columns=columns, copy=False)
+
+    def records(self, columns=None, start=0, stop=None, rows=None) -> list:
+        return self.read(columns, start, stop, rows).to_dict(orient="records")
+
+    def column_lists(self, columns=None, start=0, stop=None, rows=None) -> dict:
+        """Return ``{column: [values]}`` straight from the arrays, without rows."""
+        selector = slice(start, stop) if rows is None else rows
+        return {column: self.column(column, selector).tolist() for column in columns or self.columns}
+
+    def codes_for(self, column: str, values) -> np.ndarray:
+        dictionary = list(self.dictionary(column)[:-1])
+        return np.array([dictionary.index(value) for value in values if value in dictionary], dtype=CODE_DTYPE)
+
+    def sort_key(self, column: str) -> np.ndarray:
+        """Return per-row values whose numeric order is the column's order."""
+        if not self.is_dictionary(column):
+            return self.raw(column)
+        dictionary = self.dictionary(column)
+        order = sorted(range(len(dictionary) - 1), key=dictionary.__getitem__)
+        ranks = np.empty(len(dictionary), dtype=np.int64)
+        ranks[order] = np.arange(len(order))
+        ranks[-1] = len(order)
+        return ranks[self.raw(column)]
+
+
+class RowSelection:
+    """Sliceable, lazily materialised view over (a subset of) a store's rows.
+
+    It supports ``len()`` and slicing, which is all DRF's limit/offset
+    paginator needs, so only the requested page is ever turned into records.
+    """
+
+    def __init__(self, store: ColumnarStore, columns=None, index=None):
+        self.store = store
+        self.columns = list(columns or store.columns)
+        self.index = index
+
+    def __len__(self):
+        return self.store.row_count if self.index is None else int(len(self.index))
+
+    def __getitem__(self, item: slice) -> list:
+        if self.index is None:
+            return self.store.records(self.columns, item.start, item.stop)
+        return self.store.records(self.columns, rows=self.index[item])
+
+    def column_lists(self, item: slice) -> dict:
+        if self.index is None:
+            return self.store.column_lists(self.columns, item.start, item.stop)
+        return self.store.column_lists(self.columns, rows=self.index[item])
+
+    def frames(self, chunk_rows: int):
+        """Yield the rows as DataFrames of up to ``chunk_rows`` rows (one empty frame if none)."""
+        for start in range(0, max(len(self), 1), chunk_rows):
+            item = slice(start, start + chunk_rows)
+            if self.index is None:
+                yield self.store.read(self.columns, item.start, item.stop)
+            else:
+                yield self.store.read(self.columns, rows=self.index[item])
+
+
+def select_rows(store: ColumnarStore, fields=None, types=None, ordering=None) -> RowSelection:
+    """Filter by ``Type``, sort by one column (``-`` prefix for descending) and project."""
+    descending = bool(ordering) and ordering.startswith("-")
+    # Exactly one "-"; anything else is not a column name.
+    sort_column = ordering.removeprefix("-") if ordering else None
+    for column in (fields or []) + ([sort_column] if ordering else []):
+        if column not in store.columns:
+            raise ValueError(f"Unknown column: {column}")
+
+    index = None
+    if types:
+        codes = store.codes_for("Type", types)
+        index = np.flatnonzero(np.isin(store.raw("Type"), codes))
+
+    if ordering:
+        key = store.sort_key(sort_column)
+        if index is not None:
+            key = key[index]
+        if descending:
+            key = -key
+        order = np.argsort(key, kind="stable")
+        index = order if index is None else index[order]
+
+    return RowSelection(store, fields, index)
+
+
+def write_frame(df: pd.DataFrame, columns=None) -> ColumnarWriter:
+    with ColumnarWriter(columns) as writer:
+        writer.append(df)
+    return writer
+
+
+def open_store(dataset) -> ColumnarStore:
+    if not dataset.storage_path:
+        _migrate_legacy_rows(dataset)
+    return ColumnarStore(storage_root() / dataset.storage_path, dataset.schema)
+
+
+def _migrate_legacy_rows(dataset) -> None:
+    # Datasets uploaded before columnar storage keep their rows in the JSON
+    # ``data`` column; convert them once on first access, or all at once with
+    # the ``migrate_legacy_rows`` command.
+    columns = dataset.columns or REQUIRED_COLUMNS
+    df = pd.DataFrame(dataset.data or [], columns=columns)
+    for column in NUMERIC_COLUMNS:
+        if column in df:
+            df[column] = pd.to_numeric(df[column], errors="coerce")
+    writer = write_frame(df, columns)
+
+    # Concurrent first reads each build a store; only the first to record
+    # one keeps it, and the others switch to it and delete their own.
+    claimed = Dataset.objects.filter(pk=dataset.pk, storage_path="").update(
+        storage_path=writer.relative_path, schema=writer.schema, data=[]
+    )
+    if claimed:
+        dataset.storage_path, dataset.schema, dataset.data = writer.relative_path, writer.schema, []
+    else:
+        delete_store(writer.relative_path)
+        dataset.refresh_from_db(fields=["storage_path", "schema"])
+
+
+def delete_store(relative_path: str) -> None:
+    if relative_path:
+        shutil.rmtree(storage_root() / relative_path, ignore_errors=True)
@@ -0,0 +1,117 @@
+"""Incremental JSON rendering of large dataset details.
+
+Rendering a detail through DRF turns every row into Python objects and then
+into one byte string holding the whole document. Above ``DATASET_STREAM_ROWS``
+rows the detail views instead stream the document straight from the columnar
+store, ``STREAM_CHUNK_ROWS`` rows at a time, so memory use and the time to the
+first byte stay flat as datasets grow. ``data`` is written last, after the
+other fields.
+
+Under ASGI the response gets an async iterator that reads each chunk in a
+worker thread; given a plain generator, Django would read it to the end
+before sending anything.
+"""
+import os
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils.http import content_disposition_header
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+from .serializers import DatasetDetailSerializer
+from .storage import open_store
+
+
+STREAM_CHUNK_ROWS = 5000
+FILE_BLOCK_SIZE = 64 * 1024
+
+# Renderer formats (see ``renderers.py``) whose output can be streamed.
+STREAMABLE_FORMATS = {"json", "columnar"}
+
+
+def _encoder() -> JSONEncoder:
+    # The same output options as DRF's JSONRenderer.
+    return JSONEncoder(
+        ensure_ascii=not api_settings.UNICODE_JSON,
+        allow_nan=not api_settings.STRICT_JSON,
+        separators=(",", ":") if api_settings.COMPACT_JSON else (", ", ": "),
+    )
+
+
+def _items(encoder: JSONEncoder, values: list) -> str:
+    # The elements of a JSON array without its brackets, so chunks can be joined.
+    return encoder.encode(values)[1:-1]
+
+
+def _encode(head: dict, store, columns: list, layout: str):
+    encoder = _encoder()
+    separator, colon = encoder.item_separator, encoder.key_separator
+    document = encoder.encode(head)
+    yield f"{document[:-1]}{separator}{encoder.encode('data')}{colon}".encode()
+
+    starts = range(0, store.row_count, STREAM_CHUNK_ROWS)
+    if layout == "columns":
+        yield b"{"
+        for position, column in enumerate(columns):
+            yield f"{separator if position else ''}{encoder.encode(column)}{colon}[".encode()
+            for start in starts:
+                values = store.column(column, slice(start, start + STREAM_CHUNK_ROWS)).tolist()
+                yield f"{separator if start else ''}{_items(encoder, values)}".encode()
+            yield b"]"
+        yield b"}}"
+    else:
+        yield b"["
+        for start in starts:
+            records = store.records(columns, start, start + STREAM_CHUNK_ROWS)
+            yield f"{separator if start else ''}{_items(encoder, records)}".encode()
+        yield b"]}"
+
+
+def detail_chunks(dataset, layout: str = "records"):
+    """Return an iterator over the encoded detail document of ``dataset``.
+
+    Everything that touches the database happens here, before iteration, so
+    the chunks can be produced outside the request thread.
+    """
+    store = open_store(dataset)
+    head = dict(DatasetDetailSerializer(dataset, context={"include_data": False}).data)
+    return _encode(head, store, dataset.columns or store.columns, layout)
+
+
+async def _async_chunks(chunks):
+    next_chunk = sync_to_async(next, thread_sensitive=False)
+    while (chunk := await next_chunk(chunks, None)) is not None:
+        yield chunk
+
+
+def _file_blocks(path):
+    with open(path, "rb") as handle:
+        while block := handle.read(FILE_BLOCK_SIZE):
+            yield block
+
+
+def streaming_response(request, chunks, content_type: str) -> StreamingHttpResponse:
+    """Stream ``chunks``, through an async iterator when serving under ASGI."""
+    if isinstance(request._request, ASGIRequest):
+        chunks = _async_chunks(chunks)
+    return StreamingHttpResponse(chunks, content_type=content_type)
+
+
+def file_response(request, path, filename: str, content_type: str):
+    """Send ``path`` as an attachment.
+
+    ``FileResponse`` iterates synchronously, which Django's ASGI handler would
+    read into memory whole, so under ASGI the file is streamed in blocks.
+    """
+    if not isinstance(request._request, ASGIRequest):
+        return FileResponse(open(path, "rb"), as_attachment=True, filename=filename, content_type=content_type)
+    response = streaming_response(request, _file_blocks(path), content_type)
+    response["Content-Length"] = os.path.getsize(path)
+    response["Content-Disposition"] = content_disposition_header(True, filename)
+    return response
+
+
+def streaming_detail(request, dataset, layout: str) -> StreamingHttpResponse:
+    return streaming_response(request, detail_chunks(dataset, layout), request.accepted_renderer.media_type)
@@ -0,0 +1,153 @@
+"""Mergeable summary statistics for equipment readings.
+
+``SummaryAccumulator`` keeps count, sum, min, max and Welford's running mean
+and sum of squared deviations (``m2``) for every numeric column, plus a Type
+histogram. Two accumulators combine exactly with Chan et al.'s pairwise
+update, so chunks, worker processes and whole datasets can be summarised
+independently and merged afterwards.
+"""
+import numpy as np
+import pandas as pd
+
+from .columns import NUMERIC_COLUMNS
+
+
+SUMMARY_KEYS = {
+    "Flowrate": ("avg_flow", "min_flow", "max_flow"),
+    "Pressure": ("avg_pressure", "min_pressure", "max_pressure"),
+    "Temperature": ("avg_temp", "min_temp", "max_temp"),
+}
+
+
+class SummaryAccumulator:
+    def __init__(self, columns=NUMERIC_COLUMNS):
+        self.columns = list(columns)
+        width = len(self.columns)
+        self.count = 0
+        self.raw_count = 0
+        self.sum = np.zeros(width)
+        self.mean = np.zeros(width)
+        self.m2 = np.zeros(width)
+        self.min = np.full(width, np.inf)
+        self.max = np.full(width, -np.inf)
+        self.type_counts = {}
+
+    def observe_raw(self, rows: int) -> None:
+        """Count rows read before cleaning, for ``total_raw``/``invalid_rows``."""
+        self.raw_count += int(rows)
+
+    def update(self, df: pd.DataFrame) -> "SummaryAccumulator":
+        """Fold a cleaned frame in, handling all numeric columns at once."""
+        values = df[self.columns].to_numpy(dtype=np.float64)
+        type_counts = df["Type"].value_counts().to_dict() if "Type" in df else {}
+        return self.update_values(values, type_counts)
+
+    def update_values(self, values: np.ndarray, type_counts=None) -> "SummaryAccumulator":
+        batch = SummaryAccumulator(self.columns)
+        batch.count = int(values.shape[0])
+        if batch.count:
+            batch.sum = values.sum(axis=0)
+            batch.mean = batch.sum / batch.count
+            batch.m2 = np.square(values - batch.mean).sum(axis=0)
+            batch.min = values.min(axis=0)
+            batch.max = values.max(axis=0)
+        batch.type_counts = {key: int(value) for key, value in (type_counts or {}).items()}
+        self.merge(batch, include_raw=False)
+        return self
+
+    def merge(self, other: "SummaryAccumulator", include_raw=True) -> "SummaryAccumulator":
+        if include_raw:
+            self.raw_count += other.raw_count
+        for key, value in other.type_counts.items():
+            self.type_counts[key] = self.type_counts.get(key, 0) + value
+        if not other.count:
+            return self
+        if not self.count:
+            self.count = other.count
+            self.sum, self.mean, self.m2 = other.sum.copy(), other.mean.copy(), other.m2.copy()
+            self.min, self.max = other.min.copy(), other.max.copy()
+            return self
+
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * (other.count / total)
+        self.m2 = self.m2 + other.m2 + np.square(delta) * (self.count * other.count / total)
+        self.sum = self.sum + other.sum
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        self.count = total
+        return self
+
+    def _index(self, column: str) -> int:
+        return self.columns.index(column)
+
+    def column_mean(self, column: str) -> float:
+        return float(self.mean[self._index(column)]) if self.count else 0.0
+
+    def column_min(self, column: str) -> float:
+        return float(self.min[self._index(column)]) if self.count else 0.0
+
+    def column_max(self, column: str) -> float:
+        return float(self.max[self._index(column)]) if self.count else 0.0
+
+    def variance(self, column: str, ddof: int = 1) -> float:
+        if self.count <= ddof:
+            return 0.0
+        return float(self.m2[self._index(column)] / (self.count - ddof))
+
+    def std(self, column: str, ddof: int = 1) -> float:
+        return float(np.sqrt(self.variance(column, ddof)))
+
+    def to_summary(self, total_raw=None, invalid_rows=None) -> dict:
+        """Render the ``Dataset.summary`` payload."""
+        total_raw = self.raw_count if total_raw is None else total_raw
+        invalid_rows = total_raw - self.count if invalid_rows is None else invalid_rows
+        summary = {
+            "total": int(self.count),
+            "total_raw": int(total_raw),
+            "invalid_rows": int(invalid_rows),
+        }
+        for column, (avg_key, _, _) in SUMMARY_KEYS.items():
+            summary[avg_key] = self.column_mean(column)
+        for column, (_, min_key, max_key) in SUMMARY_KEYS.items():
+            summary[min_key] = self.column_min(column)
+            summary[max_key] = self.column_max(column)
+        summary["type_dist"] = dict(
+            sorted(self.type_counts.items(), key=lambda item: item[1], reverse=True)
+        )
+        return summary
+
+    def to_state(self) -> dict:
+        """JSON-serialisable state that ``from_state`` can merge again later."""
+        return {
+            "count": int(self.count),
+            "raw_count": int(self.raw_count),
+            "columns": {
+                column: {
+                    "sum": float(self.sum[index]),
+                    "mean": float(self.mean[index]),
+                    "m2": float(self.m2[index]),
+                    "min": float(self.min[index]) if self.count else None,
+                    "max": float(self.max[index]) if self.count else None,
+                }
+                for index, column in enumerate(self.columns)
+            },
+            "type_counts": dict(self.type_counts),
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "SummaryAccumulator":
+        columns = list(state.get("columns", {})) or NUMERIC_COLUMNS
+        accumulator = cls(columns)
+        accumulator.count = int(state.get("count", 0))
+        accumulator.raw_count = int(state.get("raw_count", 0))
+        accumulator.type_counts = dict(state.get("type_counts", {}))
+        if accumulator.count:
+            for index, column in enumerate(columns):
+                values = state["columns"][column]
+                accumulator.sum[index] = values["sum"]
+                accumulator.mean[index] = values["mean"]
+                accumulator.m2[index] = values["m2"]
+                accumulator.min[index] = values["min"]
+                accumulator.max[index] = values["max"]
+        return accumulator
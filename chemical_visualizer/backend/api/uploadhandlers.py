@@ -0,0 +1,56 @@
+import hashlib
+
+from django.core.files.uploadhandler import FileUploadHandler
+
+
+class ContentHashUploadHandler(FileUploadHandler):
+    """Hashes every uploaded file as its chunks arrive.
+
+    It passes the data on unchanged, so the default handlers after it still
+    build the uploaded file. Digests are collected on
+    ``request.upload_digests`` as ``{field_name: [(file_name, digest), ...]}``
+    in upload order, since one field can carry several files of the same name.
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.hasher = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.hasher.update(raw_data)
+        return raw_data
+
+    def file_complete(self, file_size):
+        if not hasattr(self.request, "upload_digests"):
+            self.request.upload_digests = {}
+        self.request.upload_digests.setdefault(self.field_name, []).append((self.file_name, self.hasher.hexdigest()))
+        return None
+
+
+def file_digest(file) -> str:
+    hasher = hashlib.sha256()
+    file.seek(0)
+    for chunk in file.chunks():
+        hasher.update(chunk)
+    file.seek(0)
+    return hasher.hexdigest()
+
+
+def upload_digest(request, file, field_name: str = "file") -> str:
+    """Return the SHA-256 of an uploaded file, hashing it now if needed."""
+    # ``request.FILES[field_name]`` is the last file sent in that field.
+    for file_name, digest in reversed(getattr(request, "upload_digests", {}).get(field_name, [])):
+        if file_name == file.name:
+            return digest
+    return file_digest(file)
+
+
+def upload_digests(request, uploads, field_name: str) -> list:
+    """Return the digests of ``request.FILES.getlist(field_name)``, in order.
+
+    An empty string stands for a file that still has to be hashed.
+    """
+    recorded = getattr(request, "upload_digests", {}).get(field_name, [])
+    if [file_name for file_name, _ in recorded] != [upload.name for upload in uploads]:
+        return [""] * len(uploads)
+    return [digest for _, digest in recorded]
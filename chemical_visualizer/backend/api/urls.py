@@ -1,10 +1,44 @@
 from django.urls import path
-from .views import DatasetDetail, DatasetReport, History, LatestDataset, UploadCSV
+from .views import (
+    BulkUploadCSV,
+    DatasetAggregate,
+    DatasetCompare,
+    DatasetDetail,
+    DatasetErrors,
+    DatasetExport,
+    DatasetReport,
+    DatasetRows,
+    EquipmentHistory,
+    History,
+    IngestJobDetail,
+    IngestJobList,
+    LatestDataset,
+    Metrics,
+    UploadCSV,
+    UploadSessionChunk,
+    UploadSessionComplete,
+    UploadSessionDetail,
+    UploadSessionList,
+)
 
 urlpatterns = [
     path('upload/', UploadCSV.as_view()),
+    path('upload/bulk/', BulkUploadCSV.as_view()),
+    path('uploads/', UploadSessionList.as_view()),
+    path('uploads/<uuid:pk>/', UploadSessionDetail.as_view(), name='upload-session'),
+    path('uploads/<uuid:pk>/chunks/<int:index>/', UploadSessionChunk.as_view()),
+    path('uploads/<uuid:pk>/complete/', UploadSessionComplete.as_view()),
     path('history/', History.as_view()),
     path('datasets/latest/', LatestDataset.as_view()),
+    path('datasets/compare/', DatasetCompare.as_view()),
     path('datasets/<int:pk>/', DatasetDetail.as_view()),
+    path('datasets/<int:pk>/rows/', DatasetRows.as_view()),
+    path('datasets/<int:pk>/aggregate/', DatasetAggregate.as_view()),
+    path('datasets/<int:pk>/errors/', DatasetErrors.as_view()),
+    path('datasets/<int:pk>/export/<str:export_format>/', DatasetExport.as_view()),
+    path('equipment/', EquipmentHistory.as_view()),
     path('report/<int:pk>/', DatasetReport.as_view()),
+    path('jobs/', IngestJobList.as_view()),
+    path('jobs/<uuid:pk>/', IngestJobDetail.as_view(), name='ingest-job'),
+    path('metrics/', Metrics.as_view()),
 ]
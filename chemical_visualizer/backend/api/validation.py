@@ -0,0 +1,267 @@
+"""Rule-driven row validation with a per-row error report.
+
+Every rule is evaluated on a whole chunk at once as a NumPy boolean mask,
+and a row's failures are packed into one ``uint64`` with a bit per rule.
+Rows failing a rejecting rule are dropped, and rows failing a flagging rule
+(repeated equipment names, when enabled) are kept. Both kinds are recorded in
+an ``ErrorReport``, which keeps only ``(row, bits)`` pairs for rows that
+failed something. The report is saved as two binary files next to the dataset's
+columnar store and is paged through ``/api/datasets/<id>/errors/``.
+
+Rules come from the ``DATASET_VALIDATION`` setting::
+
+    {
+        "ranges": {"Pressure": [0, 100]},              # inclusive, None = open
+        "type_ranges": {"Pump": {"Flowrate": [0, 500]}},
+        "allowed_types": ["Pump", "Valve"],             # None = any Type
+        "flag_duplicate_names": False,
+    }
+
+Duplicate names are off by default: historian exports carry many readings
+per unit, so a repeated name is normal there. Missing or non-numeric values
+and a missing Type are always rejected, as before.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+from django.core.exceptions import ImproperlyConfigured
+
+from .columns import NUMERIC_COLUMNS
+
+
+DEFAULT_CONFIG = {
+    "ranges": {},
+    "type_ranges": {},
+    "allowed_types": None,
+    "flag_duplicate_names": False,
+}
+
+ROWS_FILE = "errors_rows.bin"
+CODES_FILE = "errors_codes.bin"
+ROW_DTYPE = np.dtype("<i8")
+CODE_DTYPE = np.dtype("<u8")
+MAX_RULES = 64
+
+
+class Rule:
+    def __init__(self, code: str, message: str, check=None, reject=True):
+        self.code = code
+        self.message = message
+        self.check = check
+        self.reject = reject
+
+    def describe(self) -> dict:
+        return {"code": self.code, "message": self.message, "reject": self.reject}
+
+
+def _slug(value: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", value.lower()).strip("_")
+
+
+def _out_of_range(values: pd.Series, bounds) -> pd.Series:
+    low, high = bounds
+    mask = pd.Series(False, index=values.index)
+    if low is not None:
+        mask |= values < low
+    if high is not None:
+        mask |= values > high
+    return mask
+
+
+def _bounds_text(bounds) -> str:
+    low, high = bounds
+    return f"[{'-inf' if low is None else low}, {'inf' if high is None else high}]"
+
+
+def build_rules(config: dict) -> list:
+    rules = [
+        Rule(f"invalid_{_slug(column)}", f"{column} is missing or not a number",
+             lambda df, column=column: df[column].isna())
+        for column in NUMERIC_COLUMNS
+    ]
+    rules.append(Rule("missing_type", "Type is missing", lambda df: df["Type"].isna()))
+
+    for column, bounds in config["ranges"].items():
+        rules.append(Rule(
+            f"range_{_slug(column)}",
+            f"{column} is outside {_bounds_text(bounds)}",
+            lambda df, column=column, bounds=bounds: _out_of_range(df[column], bounds),
+        ))
+    for equipment_type, ranges in config["type_ranges"].items():
+        for column, bounds in ranges.items():
+            rules.append(Rule(
+                f"range_{_slug(column)}_{_slug(equipment_type)}",
+                f"{column} of a {equipment_type} is outside {_bounds_text(bounds)}",
+                lambda df, t=equipment_type, column=column, bounds=bounds: (
+                    (df["Type"] == t) & _out_of_range(df[column], bounds)
+                ),
+            ))
+    if config["allowed_types"] is not None:
+        allowed = list(config["allowed_types"])
+        rules.append(Rule(
+            "unknown_type",
+            f"Type is not one of {', '.join(allowed)}",
+            lambda df: df["Type"].notna() & ~df["Type"].isin(allowed),
+        ))
+    if config["flag_duplicate_names"]:
+        # Checked separately in ``Validator.flag_duplicates``; see there.
+        rules.append(Rule("duplicate_name", "Equipment Name already appeared in an earlier row", reject=False))
+
+    if len(rules) > MAX_RULES:
+        raise ImproperlyConfigured(f"DATASET_VALIDATION defines more than {MAX_RULES} rules")
+    return rules
+
+
+class ErrorReport:
+    """``(row, bits)`` pairs for failing rows, appended chunk by chunk."""
+
+    def __init__(self):
+        self._rows = []
+        self._codes = []
+
+    def add(self, rows: np.ndarray, codes: np.ndarray) -> None:
+        if len(rows):
+            self._rows.append(np.asarray(rows, dtype=ROW_DTYPE))
+            self._codes.append(np.asarray(codes, dtype=CODE_DTYPE))
+
+    def merge(self, other: "ErrorReport", offset: int = 0) -> None:
+        for rows, codes in zip(other._rows, other._codes):
+            self.add(rows + offset, codes)
+
+    def finalize(self) -> tuple:
+        """Return row-sorted arrays with each row's bits combined into one entry."""
+        if not self._rows:
+            return np.empty(0, dtype=ROW_DTYPE), np.empty(0, dtype=CODE_DTYPE)
+        rows = np.concatenate(self._rows)
+        codes = np.concatenate(self._codes)
+        order = np.argsort(rows, kind="stable")
+        rows, codes = rows[order], codes[order]
+        starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+        return rows[starts], np.bitwise_or.reduceat(codes, starts)
+
+    def save(self, path, rules: list) -> dict:
+        """Write the report into the store directory ``path``; return its schema."""
+        rows, codes = self.finalize()
+        rows.tofile(path / ROWS_FILE)
+        codes.tofile(path / CODES_FILE)
+        described = []
+        for bit, rule in enumerate(rules):
+            count = int(np.count_nonzero(codes & np.uint64(1 << bit)))
+            described.append({**rule.describe(), "count": count})
+        return {"rows": ROWS_FILE, "codes": CODES_FILE, "count": int(len(rows)), "rules": described}
+
+
+class Validator:
+    """Applies the configured rules chunk by chunk and collects an ``ErrorReport``.
+
+    ``config`` is a plain dict so worker processes can rebuild the same
+    rules (with the same bits) without Django settings.
+    """
+
+    def __init__(self, config=None):
+        self.config = {**DEFAULT_CONFIG, **(config or {})}
+        self.rules = build_rules(self.config)
+        self.report = ErrorReport()
+        self._reject_bits = np.uint64(sum(1 << bit for bit, rule in enumerate(self.rules) if rule.reject))
+        codes = [rule.code for rule in self.rules]
+        self._duplicate_bit = codes.index("duplicate_name") if "duplicate_name" in codes else None
+        # Sorted runs of the name hashes seen so far, largest first.
+        self._seen = []
+
+    def validate(self, chunk: pd.DataFrame, offset: int = 0, duplicates: bool = True) -> pd.DataFrame:
+        """Return the rows of ``chunk`` that pass every rejecting rule.
+
+        Report rows are ``offset`` plus the chunk's index, i.e. 0-based data
+        rows of the file.
+        """
+        for column in NUMERIC_COLUMNS:
+            chunk[column] = pd.to_numeric(chunk[column], errors="coerce")
+
+        bits = np.zeros(len(chunk), dtype=CODE_DTYPE)
+        for bit, rule in enumerate(self.rules):
+            if rule.check is not None:
+                bits |= rule.check(chunk).to_numpy(dtype=bool).astype(CODE_DTYPE) << np.uint64(bit)
+
+        failed = bits != 0
+        self.report.add(offset + chunk.index.to_numpy()[failed], bits[failed])
+        cleaned = chunk[(bits & self._reject_bits) == 0]
+        if duplicates:
+            self.flag_duplicates(cleaned, offset)
+        return cleaned
+
+    def flag_duplicates(self, cleaned: pd.DataFrame, offset: int = 0) -> None:
+        """Flag kept rows whose Equipment Name was already seen in this file.
+
+        Names are compared by 64-bit hash. The hashes seen so far are kept as
+        a few sorted runs, each at least twice the size of the next, so every
+        chunk is one ``searchsorted`` per run and a hash is re-merged only a
+        logarithmic number of times. It runs on kept rows only, which lets the
+        parallel parser call it in file order after merging each range.
+        """
+        if self._duplicate_bit is None or cleaned.empty:
+            return
+        names = cleaned["Equipment Name"]
+        present = names.notna().to_numpy()
+        hashes = pd.util.hash_array(names.to_numpy(dtype=object)[present])
+        repeated = pd.Series(hashes).duplicated().to_numpy() | self._seen_before(hashes)
+        self._remember(hashes)
+        rows = offset + cleaned.index.to_numpy()[present][repeated]
+        self.report.add(rows, np.full(len(rows), 1 << self._duplicate_bit, dtype=CODE_DTYPE))
+
+    def _seen_before(self, hashes: np.ndarray) -> np.ndarray:
+        found = np.zeros(len(hashes), dtype=bool)
+        for run in self._seen:
+            positions = np.minimum(np.searchsorted(run, hashes), len(run) - 1)
+            found |= run[positions] == hashes
+        return found
+
+    def _remember(self, hashes: np.ndarray) -> None:
+        run = np.unique(hashes)
+        while self._seen and len(self._seen[-1]) <= 2 * len(run):
+            run = np.union1d(self._seen.pop(), run)
+        self._seen.append(run)
+
+    def save_report(self, path) -> dict:
+        return self.report.save(path, self.rules)
+
+
+class ErrorSelection:
+    """Sliceable view over a stored error report, optionally for one rule.
+
+    Like ``RowSelection`` it only supports ``len()`` and slicing, which is
+    what the limit/offset paginator needs.
+    """
+
+    def __init__(self, path, info: dict, rule=None):
+        self.rules = info.get("rules", [])
+        count = int(info.get("count", 0))
+        if count:
+            self.rows = np.memmap(path / info["rows"], dtype=ROW_DTYPE, mode="r", shape=(count,))
+            self.codes = np.memmap(path / info["codes"], dtype=CODE_DTYPE, mode="r", shape=(count,))
+        else:
+            self.rows = np.empty(0, dtype=ROW_DTYPE)
+            self.codes = np.empty(0, dtype=CODE_DTYPE)
+
+        self.index = None
+        if rule is not None:
+            codes = [described["code"] for described in self.rules]
+            if rule not in codes:
+                raise ValueError(f"Unknown rule: {rule}")
+            self.index = np.flatnonzero(self.codes & np.uint64(1 << codes.index(rule)))
+
+    def __len__(self):
+        return len(self.rows) if self.index is None else int(len(self.index))
+
+    def __getitem__(self, item: slice) -> list:
+        selector = item if self.index is None else self.index[item]
+        rows, codes = self.rows[selector], self.codes[selector]
+        failing = [
+            (described["code"], (codes & np.uint64(1 << bit)) != 0)
+            for bit, described in enumerate(self.rules)
+        ]
+        return [
+            # ``row`` is 1-based and counts data rows, so the header is not row 1.
+            {"row": int(row) + 1, "errors": [code for code, mask in failing if mask[position]]}
+            for position, row in enumerate(rows)
+        ]
@@ -1,51 +1,140 @@
 import io
+from contextlib import ExitStack
 
 import pandas as pd
+from django.conf import settings
 from django.http import FileResponse, Http404
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.units import inch
-from reportlab.pdfgen import canvas
+from django.urls import reverse
+from django.utils.cache import patch_vary_headers
+from django.utils.http import content_disposition_header
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .models import Dataset
-from .serializers import DatasetDetailSerializer, DatasetListSerializer
+from .aggregates import DEFAULT_BINS, DEFAULT_POINTS, MAX_BINS, MAX_POINTS, aggregate
+from .bulk import collect_sources, ingest_bulk
+from .caching import (
+    VALIDATOR_FIELDS,
+    cached_payload,
+    collection_etag,
+    conditional_response,
+    dataset_etag,
+    detail_key,
+    set_validators,
+)
+from .columns import NUMERIC_COLUMNS
+from .compare import DEFAULT_EQUIPMENT_LIMIT, MAX_DATASETS, MAX_EQUIPMENT_LIMIT, compare
+from .datasets import create_dataset, find_duplicate
+from .equipment import equipment_history
+from .exports import available_formats, content_type, export_filename, export_path, stream_csv_export, write_export
+from .ingest import InvalidCSVError
+from .jobs import resume_jobs, submit_upload
+from .metrics import REGISTRY, MetricsScrapePermission, count, span
+from .models import Dataset, IngestJob, UploadSession
+from .pagination import DatasetRowsPagination
+from .renderers import DATASET_RENDERERS, PrometheusRenderer, data_layout
+from .resumable import UploadError, abort_session, complete_session, missing_chunks, start_session, write_chunk
+from .reports import REPORT_VERSION, ensure_report, report_filename
+from .serializers import (
+    DatasetDetailSerializer,
+    DatasetListSerializer,
+    IngestJobSerializer,
+    UploadSessionSerializer,
+)
+from .storage import open_store, select_rows
+from .streaming import STREAMABLE_FORMATS, file_response, streaming_detail, streaming_response
+from .summary import SummaryAccumulator
+from .uploadhandlers import upload_digest, upload_digests
+from .validation import ErrorSelection
 
 
-REQUIRED_COLUMNS = [
-    "Equipment Name",
-    "Type",
-    "Flowrate",
-    "Pressure",
-    "Temperature",
-]
+def _build_summary(df: pd.DataFrame, total_raw: int, invalid_rows: int) -> dict:
+    return SummaryAccumulator().update(df).to_summary(total_raw, invalid_rows)
 
 
-def _safe_float(value) -> float:
-    return float(value) if pd.notna(value) else 0.0
+def _list_param(request, name: str) -> list:
+    value = request.query_params.get(name, "")
+    return [item.strip() for item in value.split(",") if item.strip()]
 
 
-def _build_summary(df: pd.DataFrame, total_raw: int, invalid_rows: int) -> dict:
+def _int_param(request, name: str, default: int, maximum: int) -> int:
+    value = request.query_params.get(name)
+    if value is None:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer")
+    if not 1 <= number <= maximum:
+        raise ValueError(f"{name} must be between 1 and {maximum}")
+    return number
+
+
+def _detail_context(request) -> dict:
+    # ``?data=false`` returns the dataset without its rows, for clients that
+    # page through ``/rows/`` instead.
     return {
-        "total": int(len(df)),
-        "total_raw": int(total_raw),
-        "invalid_rows": int(invalid_rows),
-        "avg_flow": _safe_float(df["Flowrate"].mean()),
-        "avg_pressure": _safe_float(df["Pressure"].mean()),
-        "avg_temp": _safe_float(df["Temperature"].mean()),
-        "min_flow": _safe_float(df["Flowrate"].min()),
-        "max_flow": _safe_float(df["Flowrate"].max()),
-        "min_pressure": _safe_float(df["Pressure"].min()),
-        "max_pressure": _safe_float(df["Pressure"].max()),
-        "min_temp": _safe_float(df["Temperature"].min()),
-        "max_temp": _safe_float(df["Temperature"].max()),
-        "type_dist": df["Type"].value_counts().to_dict(),
+        "include_data": request.query_params.get("data", "true").lower() != "false",
+        "layout": data_layout(request),
     }
 
 
+def _detail_response(request, dataset, immutable: bool) -> Response:
+    """Serve a dataset detail with validators, from cache when possible.
+
+    ``dataset`` only needs ``VALIDATOR_FIELDS`` loaded: a matching
+    conditional request is answered with 304 before any rows are read.
+    """
+    context = _detail_context(request)
+    variant = f"rows-{context['layout']}" if context["include_data"] else "meta"
+    etag = dataset_etag(dataset, "detail", variant, request.accepted_renderer.format)
+    not_modified = conditional_response(request, etag, dataset.uploaded_at, immutable)
+    if not_modified is not None:
+        patch_vary_headers(not_modified, ["Accept"])
+        return not_modified
+
+    streamable = request.accepted_renderer.format in STREAMABLE_FORMATS
+    if context["include_data"] and streamable and dataset.row_count > settings.DATASET_STREAM_ROWS:
+        full = Dataset.objects.defer("data").get(pk=dataset.pk)
+        count("rows", full.row_count)
+        response = streaming_detail(request, full, context["layout"])
+        set_validators(response, etag, dataset.uploaded_at, immutable)
+        patch_vary_headers(response, ["Accept"])
+        return response
+
+    def build():
+        with span("serialize"):
+            full = Dataset.objects.defer("data").get(pk=dataset.pk)
+            if context["include_data"]:
+                count("rows", full.row_count)
+            return dict(DatasetDetailSerializer(full, context=context).data)
+
+    payload = cached_payload(
+        detail_key(dataset, variant),
+        build,
+        cacheable=dataset.row_count <= settings.DATASET_CACHE_MAX_ROWS,
+    )
+    response = set_validators(Response(payload), etag, dataset.uploaded_at, immutable)
+    patch_vary_headers(response, ["Accept"])
+    return response
+
+
+def _wants_async(request) -> bool:
+    prefer = request.headers.get("Prefer", "")
+    return "respond-async" in prefer or request.query_params.get("async", "").lower() == "true"
+
+
+def _job_response(job: IngestJob, status: int) -> Response:
+    return Response(
+        IngestJobSerializer(job).data,
+        status=status,
+        headers={"Location": reverse("ingest-job", args=[job.pk])},
+    )
+
+
 class UploadCSV(APIView):
     permission_classes = [IsAuthenticated]
+    renderer_classes = DATASET_RENDERERS
 
     def post(self, request):
         file = request.FILES.get("file")
@@ -53,141 +142,414 @@ class UploadCSV(APIView):
         if not file:
             return Response({"error": "No file uploaded"}, status=400)
 
-        # Read CSV
-        try:
-            raw_df = pd.read_csv(file)
-        except Exception:
-            return Response({"error": "Invalid CSV file"}, status=400)
-
-        missing = [col for col in REQUIRED_COLUMNS if col not in raw_df.columns]
-        if missing:
+        with span("hash"):
+            content_hash = upload_digest(request, file)
+        duplicate = find_duplicate(content_hash)
+        if duplicate:
             return Response(
-                {"error": "Missing required columns", "missing": missing},
-                status=400,
+                DatasetDetailSerializer(duplicate, context=_detail_context(request)).data,
+                headers={"X-Duplicate-Of": str(duplicate.pk)},
             )
 
-        df = raw_df[REQUIRED_COLUMNS].copy()
-        df["Flowrate"] = pd.to_numeric(df["Flowrate"], errors="coerce")
-        df["Pressure"] = pd.to_numeric(df["Pressure"], errors="coerce")
-        df["Temperature"] = pd.to_numeric(df["Temperature"], errors="coerce")
-        df = df.dropna(subset=["Flowrate", "Pressure", "Temperature", "Type"])
-
-        total_raw = int(len(raw_df))
-        invalid_rows = total_raw - int(len(df))
-        summary = _build_summary(df, total_raw, invalid_rows)
-
-        file.seek(0)
-        dataset = Dataset.objects.create(
-            name=file.name,
-            file=file,
-            summary=summary,
-            row_count=int(len(df)),
-            columns=REQUIRED_COLUMNS,
-            data=df.to_dict(orient="records"),
-        )
+        if _wants_async(request):
+            return _job_response(submit_upload(file, content_hash), status=202)
+
+        try:
+            dataset = create_dataset(file, file.name, content_hash=content_hash)
+        except InvalidCSVError as exc:
+            return Response(exc.payload, status=400)
+
+        with span("serialize"):
+            data = DatasetDetailSerializer(dataset, context=_detail_context(request)).data
+        return Response(data)
+
+
+class BulkUploadCSV(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        uploads = request.FILES.getlist("files")
+        if not uploads:
+            return Response({"error": "No file uploaded"}, status=400)
+
+        with ExitStack() as stack:
+            try:
+                sources = collect_sources(uploads, stack, upload_digests(request, uploads, "files"))
+            except InvalidCSVError as exc:
+                return Response(exc.payload, status=400)
+            if not sources:
+                return Response({"error": "No CSV files found"}, status=400)
+            return Response({"results": ingest_bulk(sources)})
+
+
+def _get_session(pk) -> UploadSession:
+    try:
+        return UploadSession.objects.get(pk=pk)
+    except UploadSession.DoesNotExist:
+        raise Http404
+
+
+def _session_response(session: UploadSession, status: int = 200) -> Response:
+    return Response(
+        UploadSessionSerializer(session).data,
+        status=status,
+        headers={"Location": reverse("upload-session", args=[session.pk])},
+    )
+
+
+class UploadSessionList(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        name = str(request.data.get("name", "")).strip()
+        if not name:
+            return Response({"error": "name is required"}, status=400)
+        try:
+            size = int(request.data.get("size", 0))
+        except (TypeError, ValueError):
+            return Response({"error": "size must be an integer"}, status=400)
+        try:
+            session = start_session(name, size)
+        except UploadError as exc:
+            return Response(exc.payload, status=400)
+        return _session_response(session, status=201)
+
 
-        # Keep only last 5 uploads
-        all_data = Dataset.objects.order_by("-uploaded_at")
-        if all_data.count() > 5:
-            for old in all_data[5:]:
-                old.delete()
+class UploadSessionDetail(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        return _session_response(_get_session(pk))
+
+    def delete(self, request, pk):
+        abort_session(_get_session(pk))
+        return Response(status=204)
+
+
+class UploadSessionChunk(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def put(self, request, pk, index):
+        session = _get_session(pk)
+        try:
+            write_chunk(session, index, request.stream or io.BytesIO())
+        except UploadError as exc:
+            return Response(exc.payload, status=400)
+
+        # Start ingesting as soon as the last chunk is in.
+        if not missing_chunks(session):
+            complete_session(session)
+        return _session_response(session)
+
+
+class UploadSessionComplete(APIView):
+    permission_classes = [IsAuthenticated]
 
-        return Response(DatasetDetailSerializer(dataset).data)
+    def post(self, request, pk):
+        session = _get_session(pk)
+        try:
+            job = complete_session(session)
+        except UploadError as exc:
+            return Response(exc.payload, status=400)
+        if job is None:
+            return _session_response(session, status=202)
+        job.refresh_from_db()
+        return _job_response(job, status=202)
 
 
 class History(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        data = Dataset.objects.order_by("-uploaded_at")[:5]
-        serializer = DatasetListSerializer(data, many=True)
-        return Response(serializer.data)
+        limit = settings.DATASET_HISTORY_LIMIT
+        recent = list(Dataset.objects.order_by("-uploaded_at").only(*VALIDATOR_FIELDS)[:limit])
+        etag = collection_etag("history", recent)
+        not_modified = conditional_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        def build():
+            data = (
+                Dataset.objects.filter(pk__in=[dataset.pk for dataset in recent])
+                .only(*DatasetListSerializer.Meta.fields)
+                .order_by("-uploaded_at")
+            )
+            return list(DatasetListSerializer(data, many=True).data)
+
+        # The key is derived from the current history, so an upload or an
+        # eviction in any process makes a stale entry unreachable.
+        payload = cached_payload(f"dataset-history:{etag}", build)
+        return set_validators(Response(payload), etag)
 
 
 class DatasetDetail(APIView):
     permission_classes = [IsAuthenticated]
+    renderer_classes = DATASET_RENDERERS
 
     def get(self, request, pk):
         try:
-            dataset = Dataset.objects.get(pk=pk)
+            dataset = Dataset.objects.only(*VALIDATOR_FIELDS).get(pk=pk)
         except Dataset.DoesNotExist:
             raise Http404
 
-        return Response(DatasetDetailSerializer(dataset).data)
+        return _detail_response(request, dataset, immutable=True)
 
 
-class LatestDataset(APIView):
+class DatasetCompare(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        dataset = Dataset.objects.order_by("-uploaded_at").first()
-        if not dataset:
-            return Response({"detail": "No datasets"}, status=404)
-        return Response(DatasetDetailSerializer(dataset).data)
+        ids = _list_param(request, "ids")
+        if not all(value.isdigit() for value in ids):
+            return Response({"error": "ids must be dataset ids"}, status=400)
+        ids = list(dict.fromkeys(int(value) for value in ids))
+        if not 2 <= len(ids) <= MAX_DATASETS:
+            return Response({"error": f"Compare between 2 and {MAX_DATASETS} datasets"}, status=400)
+        try:
+            limit = _int_param(request, "limit", DEFAULT_EQUIPMENT_LIMIT, MAX_EQUIPMENT_LIMIT)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=400)
 
+        datasets = list(Dataset.objects.filter(pk__in=ids).only(*VALIDATOR_FIELDS).order_by("uploaded_at", "pk"))
+        missing = sorted(set(ids) - {dataset.pk for dataset in datasets})
+        if missing:
+            return Response({"error": "Unknown datasets", "missing": missing}, status=400)
 
-class DatasetReport(APIView):
+        etag = collection_etag(f"compare-{limit}-{request.accepted_renderer.format}", datasets)
+        not_modified = conditional_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        def build():
+            full = Dataset.objects.filter(pk__in=ids).defer("data").order_by("uploaded_at", "pk")
+            return compare(list(full), equipment_limit=limit)
+
+        key = collection_etag(f"dataset-compare-{limit}", datasets)
+        payload = cached_payload(key, build)
+        return set_validators(Response(payload), etag)
+
+
+class DatasetRows(APIView):
     permission_classes = [IsAuthenticated]
+    renderer_classes = DATASET_RENDERERS
+    pagination_class = DatasetRowsPagination
 
     def get(self, request, pk):
         try:
-            dataset = Dataset.objects.get(pk=pk)
+            dataset = Dataset.objects.defer("data").get(pk=pk)
         except Dataset.DoesNotExist:
             raise Http404
 
-        buffer = io.BytesIO()
-        pdf = canvas.Canvas(buffer, pagesize=letter)
+        try:
+            rows = select_rows(
+                open_store(dataset),
+                fields=_list_param(request, "fields"),
+                types=_list_param(request, "type"),
+                ordering=request.query_params.get("ordering"),
+            )
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=400)
 
-        pdf.setTitle(f"Dataset Report - {dataset.name}")
-        pdf.setFont("Helvetica-Bold", 16)
-        pdf.drawString(1 * inch, 10.5 * inch, "Chemical Equipment Report")
+        paginator = self.pagination_class()
+        if data_layout(request) == "columns":
+            page = paginator.paginate_columns(rows, request)
+        else:
+            page = paginator.paginate_queryset(rows, request, view=self)
+        response = paginator.get_paginated_response(page)
+        patch_vary_headers(response, ["Accept"])
+        return response
 
-        pdf.setFont("Helvetica", 12)
-        pdf.drawString(1 * inch, 10.0 * inch, f"Dataset: {dataset.name}")
-        pdf.drawString(1 * inch, 9.7 * inch, f"Uploaded: {dataset.uploaded_at}")
-        pdf.drawString(1 * inch, 9.4 * inch, f"Total Records: {dataset.row_count}")
 
-        summary = dataset.summary or {}
-        pdf.drawString(
-            1 * inch,
-            8.9 * inch,
-            f"Average Flowrate: {summary.get('avg_flow', 0):.2f} (Min: {summary.get('min_flow', 0):.2f}, Max: {summary.get('max_flow', 0):.2f})",
-        )
-        pdf.drawString(
-            1 * inch,
-            8.6 * inch,
-            f"Average Pressure: {summary.get('avg_pressure', 0):.2f} (Min: {summary.get('min_pressure', 0):.2f}, Max: {summary.get('max_pressure', 0):.2f})",
-        )
-        pdf.drawString(
-            1 * inch,
-            8.3 * inch,
-            f"Average Temperature: {summary.get('avg_temp', 0):.2f} (Min: {summary.get('min_temp', 0):.2f}, Max: {summary.get('max_temp', 0):.2f})",
-        )
-        pdf.drawString(
-            1 * inch,
-            8.0 * inch,
-            f"Invalid Rows: {summary.get('invalid_rows', 0)} | Total Uploaded: {summary.get('total_raw', dataset.row_count)}",
-        )
+class DatasetErrors(APIView):
+    permission_classes = [IsAuthenticated]
+    pagination_class = DatasetRowsPagination
+
+    def get(self, request, pk):
+        try:
+            dataset = Dataset.objects.only("id", "storage_path", "schema").get(pk=pk)
+        except Dataset.DoesNotExist:
+            raise Http404
+
+        # Datasets ingested before validation reports were stored have none.
+        info = (dataset.schema or {}).get("errors", {})
+        try:
+            errors = ErrorSelection(open_store(dataset).path, info, rule=request.query_params.get("rule"))
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=400)
+
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(errors, request, view=self)
+        response = paginator.get_paginated_response(page)
+        response.data["rules"] = info.get("rules", [])
+        return response
+
+
+class DatasetExport(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk, export_format):
+        formats = available_formats()
+        if export_format not in formats:
+            return Response({"error": f"Unsupported export format: {export_format}", "formats": formats}, status=400)
+        try:
+            dataset = Dataset.objects.defer("data").get(pk=pk)
+        except Dataset.DoesNotExist:
+            raise Http404
 
-        pdf.setFont("Helvetica-Bold", 12)
-        pdf.drawString(1 * inch, 7.5 * inch, "Type Distribution")
-        pdf.setFont("Helvetica", 11)
+        types = _list_param(request, "type")
+        try:
+            selection = select_rows(open_store(dataset), fields=_list_param(request, "fields"), types=types)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=400)
+
+        path = export_path(selection, export_format, types)
+        etag = dataset_etag(dataset, "export", path.name)
+        not_modified = conditional_response(request, etag, dataset.uploaded_at, immutable=True)
+        if not_modified is not None:
+            return not_modified
+
+        filename = export_filename(dataset, export_format)
+        if path.exists():
+            response = file_response(request, path, filename, content_type(export_format))
+        elif export_format == "csv":
+            # Sent while it is encoded; the cached copy is kept once complete.
+            count("rows", len(selection))
+            response = streaming_response(request, stream_csv_export(selection, path), content_type(export_format))
+            response["Content-Disposition"] = content_disposition_header(True, filename)
+        else:
+            count("rows", len(selection))
+            try:
+                with span("export"):
+                    write_export(selection, export_format, path)
+            except ValueError as exc:
+                return Response({"error": str(exc)}, status=400)
+            response = file_response(request, path, filename, content_type(export_format))
+        return set_validators(response, etag, dataset.uploaded_at, immutable=True)
+
+
+class DatasetAggregate(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        try:
+            dataset = Dataset.objects.only(*VALIDATOR_FIELDS).get(pk=pk)
+        except Dataset.DoesNotExist:
+            raise Http404
+
+        try:
+            options = {
+                "bins": _int_param(request, "bins", DEFAULT_BINS, MAX_BINS),
+                "points": _int_param(request, "points", DEFAULT_POINTS, MAX_POINTS),
+                "x": request.query_params.get("x", "Flowrate"),
+                "y": request.query_params.get("y", "Pressure"),
+            }
+            for axis in ("x", "y"):
+                if options[axis] not in NUMERIC_COLUMNS:
+                    raise ValueError(f"Unknown numeric column: {options[axis]}")
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=400)
+
+        parts = ("aggregate", *options.values())
+        etag = dataset_etag(dataset, *parts, request.accepted_renderer.format)
+        not_modified = conditional_response(request, etag, dataset.uploaded_at, immutable=True)
+        if not_modified is not None:
+            return not_modified
+
+        def build():
+            full = Dataset.objects.defer("data").get(pk=dataset.pk)
+            return aggregate(open_store(full), **options)
+
+        payload = cached_payload(f"dataset-aggregate:{dataset_etag(dataset, *parts)}", build)
+        return set_validators(Response(payload), etag, dataset.uploaded_at, immutable=True)
+
+
+class LatestDataset(APIView):
+    permission_classes = [IsAuthenticated]
+    renderer_classes = DATASET_RENDERERS
 
-        y = 7.2 * inch
-        for equipment_type, count in (summary.get("type_dist") or {}).items():
-            pdf.drawString(1 * inch, y, f"{equipment_type}: {count}")
-            y -= 0.25 * inch
-            if y < 1.25 * inch:
-                pdf.showPage()
-                y = 10.5 * inch
+    def get(self, request):
+        dataset = Dataset.objects.order_by("-uploaded_at").only(*VALIDATOR_FIELDS).first()
+        if not dataset:
+            job = IngestJob.objects.filter(status__in=IngestJob.ACTIVE_STATUSES).order_by("-created_at").first()
+            if job:
+                resume_jobs()
+                job.refresh_from_db()
+                return _job_response(job, status=202)
+            return Response({"detail": "No datasets"}, status=404)
+        # "Latest" changes with every upload, so clients must revalidate.
+        return _detail_response(request, dataset, immutable=False)
 
-        pdf.showPage()
-        pdf.save()
 
-        buffer.seek(0)
-        return FileResponse(
-            buffer,
+class EquipmentHistory(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        name = request.query_params.get("name", "").strip()
+        if not name:
+            return Response({"error": "name is required"}, status=400)
+        equipment_type = request.query_params.get("type", "").strip() or None
+
+        return Response({
+            "equipment_name": name,
+            "type": equipment_type,
+            "readings": equipment_history(name, equipment_type),
+        })
+
+
+class IngestJobList(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        jobs = IngestJob.objects.order_by("-created_at")[:20]
+        return Response(IngestJobSerializer(jobs, many=True).data)
+
+
+class IngestJobDetail(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        try:
+            job = IngestJob.objects.get(pk=pk)
+        except IngestJob.DoesNotExist:
+            raise Http404
+
+        if job.status in IngestJob.ACTIVE_STATUSES:
+            # Picks the job up again if the process running it has died.
+            resume_jobs()
+            job.refresh_from_db()
+        return Response(IngestJobSerializer(job).data)
+
+
+class DatasetReport(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        try:
+            dataset = Dataset.objects.defer("data").get(pk=pk)
+        except Dataset.DoesNotExist:
+            raise Http404
+
+        # Datasets never change after upload, so the report only depends on
+        # the dataset and the report layout version.
+        etag = dataset_etag(dataset, f"report-v{REPORT_VERSION}")
+        not_modified = conditional_response(request, etag, dataset.uploaded_at)
+        if not_modified is not None:
+            return not_modified
+
+        with span("report"):
+            report = ensure_report(dataset)
+        response = FileResponse(
+            report.open("rb"),
             as_attachment=True,
-            filename=f"dataset-report-{dataset.pk}.pdf",
+            filename=report_filename(dataset),
             content_type="application/pdf",
         )
+        return set_validators(response, etag, dataset.uploaded_at)
+
+
+class Metrics(APIView):
+    permission_classes = [MetricsScrapePermission]
+    renderer_classes = [PrometheusRenderer]
+
+    def get(self, request):
+        return Response(REGISTRY.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
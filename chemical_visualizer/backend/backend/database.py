@@ -0,0 +1,45 @@
+"""``DATABASE_URL`` parsing for the settings module."""
+import os
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from django.core.exceptions import ImproperlyConfigured
+
+
+def _flag(environ, name: str) -> bool:
+    return environ.get(name, "false").lower() == "true"
+
+
+def parse_database_url(url: str, environ=os.environ):
+    """Return the ``DATABASES["default"]`` entry for ``url``, or None when it is empty.
+
+    Query parameters such as ``?sslmode=require`` become connection options.
+    Connections persist for ``DB_CONN_MAX_AGE`` seconds or, with
+    ``DB_POOL=true``, come from a psycopg connection pool of
+    ``DB_POOL_MIN_SIZE`` to ``DB_POOL_MAX_SIZE`` connections instead.
+    """
+    parsed = urlsplit(url)
+    if not parsed.scheme:
+        return None
+    if parsed.scheme not in ("postgres", "postgresql"):
+        raise ImproperlyConfigured(f"Unsupported DATABASE_URL scheme: {parsed.scheme}")
+
+    pool = _flag(environ, "DB_POOL")
+    options = dict(parse_qsl(parsed.query))
+    if pool:
+        options["pool"] = {
+            "min_size": int(environ.get("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(environ.get("DB_POOL_MAX_SIZE", "10")),
+            "timeout": int(environ.get("DB_POOL_TIMEOUT", "10")),
+        }
+    return {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': unquote(parsed.path.lstrip("/")),
+        'USER': unquote(parsed.username or ""),
+        'PASSWORD': unquote(parsed.password or ""),
+        'HOST': parsed.hostname or "",
+        'PORT': str(parsed.port or ""),
+        # Pooled connections are returned to the pool instead of persisting.
+        'CONN_MAX_AGE': 0 if pool else int(environ.get("DB_CONN_MAX_AGE", "60")),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': options,
+    }
@@ -1,33 +1,597 @@
+import io
+import json
+import os
 import sys
+import shutil
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import suppress
+from pathlib import Path
 
 import matplotlib
+import numpy as np
 import requests
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import (
+	QAbstractTableModel,
+	QModelIndex,
+	QObject,
+	QRunnable,
+	Qt,
+	QThreadPool,
+	QTimer,
+	pyqtSignal,
+)
 from PyQt5.QtWidgets import (
 	QApplication,
 	QFileDialog,
 	QFormLayout,
 	QHBoxLayout,
+	QHeaderView,
 	QLabel,
 	QLineEdit,
 	QListWidget,
 	QListWidgetItem,
 	QMainWindow,
 	QMessageBox,
+	QProgressBar,
 	QPushButton,
-	QTableWidget,
-	QTableWidgetItem,
+	QTableView,
 	QVBoxLayout,
 	QWidget,
 )
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 
 
 matplotlib.use("Qt5Agg")
 
 API_URL = "http://127.0.0.1:8000/api"
+# Rows are fetched this many at a time as the table is scrolled.
+ROWS_PAGE_SIZE = 2000
+COLUMNAR_MEDIA_TYPE = "application/vnd.chemviz.columnar+json"
+JOB_POLL_INTERVAL_MS = 1000
+
+# Files at least this big go through the resumable chunked upload, with
+# UPLOAD_PARALLELISM chunks in flight. Unfinished sessions are remembered in
+# RESUME_STATE_PATH so the next upload of the same file continues them.
+RESUMABLE_THRESHOLD = 32 * 1024 * 1024
+UPLOAD_PARALLELISM = 4
+CHUNK_RETRIES = 3
+RESUME_STATE_PATH = Path.home() / ".chemviz_uploads.json"
+
+# Network calls run on a thread pool of this many threads, sharing one
+# keep-alive session with as many pooled connections.
+NETWORK_THREADS = UPLOAD_PARALLELISM + 4
+DOWNLOAD_BLOCK_SIZE = 64 * 1024
+
+# Datasets, their rows and their reports are kept between runs in the user's
+# cache directory, up to this many bytes; see DatasetCache.
+CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+
+class Cancelled(Exception):
+	"""Raised inside a worker whose request has been superseded."""
+
+
+class WorkerSignals(QObject):
+	result = pyqtSignal(object)
+	error = pyqtSignal(object)
+	# Byte counts may exceed a C int, so they are sent as Python objects.
+	progress = pyqtSignal(object, object)
+	done = pyqtSignal()
+
+
+class Worker(QRunnable):
+	"""Runs ``fn(worker)`` on a thread pool and signals the outcome back.
+
+	``fn`` must not touch widgets. It may call ``worker.report(done, total)``
+	and ``worker.check()``, which raises ``Cancelled`` once the worker has
+	been cancelled. Nothing is signalled for a cancelled worker.
+	"""
+
+	def __init__(self, fn):
+		super().__init__()
+		self.setAutoDelete(False)
+		self.fn = fn
+		self.signals = WorkerSignals()
+		self.cancelled = threading.Event()
+		self.last_percent = None
+
+	def cancel(self):
+		self.cancelled.set()
+
+	def check(self):
+		if self.cancelled.is_set():
+			raise Cancelled()
+
+	def report(self, done, total):
+		# Bodies are sent in small blocks; only signal when the percentage moves.
+		percent = done * 100 // total if total else None
+		if percent != self.last_percent or percent is None:
+			self.last_percent = percent
+			self.signals.progress.emit(done, total)
+
+	def run(self):
+		try:
+			result = self.fn(self)
+		except Exception as exc:
+			if not self.cancelled.is_set():
+				self.signals.error.emit(exc)
+		else:
+			if not self.cancelled.is_set():
+				self.signals.result.emit(result)
+		finally:
+			self.signals.done.emit()
+
+
+class ApiClient:
+	"""Runs API calls on a thread pool over one keep-alive ``requests.Session``.
+
+	Calls are submitted to named channels. Submitting to a channel cancels the
+	call still running there: its result is dropped, and streamed uploads and
+	downloads stop at the next block.
+	"""
+
+	def __init__(self, base_url):
+		self.base_url = base_url
+		self.session = requests.Session()
+		adapter = HTTPAdapter(pool_connections=1, pool_maxsize=NETWORK_THREADS)
+		self.session.mount("http://", adapter)
+		self.session.mount("https://", adapter)
+		self.pool = QThreadPool()
+		self.pool.setMaxThreadCount(NETWORK_THREADS)
+		self.channels = {}
+		self.running = set()
+
+	def request(self, method, path, **kwargs):
+		response = self.session.request(method, f"{self.base_url}{path}", **kwargs)
+		response.raise_for_status()
+		return response
+
+	def submit(self, channel, fn, on_result, on_error=None, on_progress=None):
+		self.cancel(channel)
+		worker = Worker(fn)
+		self.channels[channel] = worker
+		self.running.add(worker)
+
+		# Slots run on the GUI thread, as does ``cancel``, so a result that was
+		# already queued when its worker got cancelled is still dropped here.
+		def unless_cancelled(callback):
+			def slot(*args):
+				if not worker.cancelled.is_set():
+					callback(*args)
+			return slot
+
+		worker.signals.result.connect(unless_cancelled(on_result))
+		if on_error is not None:
+			worker.signals.error.connect(unless_cancelled(on_error))
+		if on_progress is not None:
+			worker.signals.progress.connect(unless_cancelled(on_progress))
+		worker.signals.done.connect(lambda: self.finished(channel, worker))
+		self.pool.start(worker)
+		return worker
+
+	def finished(self, channel, worker):
+		self.running.discard(worker)
+		if self.channels.get(channel) is worker:
+			del self.channels[channel]
+
+	def cancel(self, channel):
+		worker = self.channels.pop(channel, None)
+		if worker is not None:
+			worker.cancel()
+
+	def cancel_all(self):
+		for channel in list(self.channels):
+			self.cancel(channel)
+
+
+class UploadBody:
+	"""A multipart/form-data body streamed from files on disk.
+
+	requests sends it with a Content-Length and reads it block by block, so
+	``worker`` sees the progress and can cancel the upload between blocks.
+	"""
+
+	def __init__(self, files, worker):
+		self.worker = worker
+		boundary = uuid.uuid4().hex
+		self.content_type = f"multipart/form-data; boundary={boundary}"
+		self.parts = []
+		self.length = 0
+		try:
+			for field, path in files:
+				filename = os.path.basename(path).replace('"', "%22")
+				head = (
+					f"--{boundary}\r\n"
+					f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+					"Content-Type: application/octet-stream\r\n\r\n"
+				).encode("utf-8")
+				self.add(io.BytesIO(head), len(head))
+				self.add(open(path, "rb"), os.path.getsize(path))
+				self.add(io.BytesIO(b"\r\n"), 2)
+			tail = f"--{boundary}--\r\n".encode("utf-8")
+			self.add(io.BytesIO(tail), len(tail))
+		except BaseException:
+			self.close()
+			raise
+		self.sent = 0
+
+	def add(self, part, size):
+		self.parts.append(part)
+		self.length += size
+
+	def __len__(self):
+		return self.length
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc_info):
+		self.close()
+
+	def read(self, size=-1):
+		self.worker.check()
+		if size is None or size < 0:
+			size = self.length
+		blocks = []
+		while size > 0 and self.parts:
+			block = self.parts[0].read(size)
+			if not block:
+				self.parts.pop(0).close()
+				continue
+			blocks.append(block)
+			size -= len(block)
+		data = b"".join(blocks)
+		self.sent += len(data)
+		self.worker.report(self.sent, self.length)
+		return data
+
+	def close(self):
+		for part in self.parts:
+			part.close()
+		self.parts = []
+
+
+def user_cache_dir():
+	if sys.platform == "win32":
+		base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+	elif sys.platform == "darwin":
+		base = Path.home() / "Library" / "Caches"
+	else:
+		base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+	return Path(base) / "chemviz"
+
+
+class DatasetCache:
+	"""Datasets kept on disk between runs, keyed by dataset id.
+
+	Each entry is a directory holding the dataset summary as JSON, its rows
+	as an ``.npz`` of column arrays and its PDF report. A dataset never
+	changes after upload, so the ETag of its summary versions the whole
+	entry: when revalidation returns a new one, the old rows and report are
+	dropped. ``index.json`` records the size and last use of every entry, and
+	the least recently used entries are removed once the total passes
+	``max_bytes``. Workers write rows and reports, so the index is guarded by
+	a lock. Reads only mark an entry as used in memory; the index is written
+	when files are stored or evicted, and by ``flush`` on shutdown.
+	"""
+
+	def __init__(self, root, max_bytes):
+		self.root = Path(root)
+		self.max_bytes = max_bytes
+		self.lock = threading.Lock()
+		self.index = {"datasets": {}, "latest": None, "history": None}
+		self.dirty = False
+		try:
+			self.root.mkdir(parents=True, exist_ok=True)
+			self.index.update(json.loads((self.root / "index.json").read_text()))
+		except (OSError, ValueError):
+			pass
+
+	def entry_dir(self, dataset_id):
+		return self.root / str(dataset_id)
+
+	def version(self, dataset_id):
+		with self.lock:
+			entry = self.index["datasets"].get(str(dataset_id))
+			return entry["etag"] if entry else None
+
+	def path(self, dataset_id, name):
+		"""Return the path of a cached file and mark its entry as used, or None."""
+		with self.lock:
+			entry = self.index["datasets"].get(str(dataset_id))
+			if entry is None or name not in entry["files"]:
+				return None
+			entry["used"] = time.time()
+			self.dirty = True
+		return self.entry_dir(dataset_id) / name
+
+	def dataset(self, dataset_id):
+		"""Return ``(etag, summary)`` of a cached dataset, or ``(None, None)``."""
+		path = self.path(dataset_id, "dataset.json")
+		if path is None:
+			return None, None
+		try:
+			return self.version(dataset_id), json.loads(path.read_text())
+		except (OSError, ValueError):
+			return None, None
+
+	def rows(self, dataset_id):
+		path = self.path(dataset_id, "rows.npz")
+		if path is None:
+			return None
+		try:
+			with np.load(path) as data:
+				return {column: data[column] for column in data.files}
+		except (OSError, ValueError, zipfile.BadZipFile):
+			return None
+
+	def report(self, dataset_id):
+		"""Return ``(etag, path)`` of a cached report, or ``(None, None)``."""
+		path = self.path(dataset_id, "report.pdf")
+		if path is None:
+			return None, None
+		with self.lock:
+			entry = self.index["datasets"].get(str(dataset_id)) or {}
+			return entry.get("report_etag"), path
+
+	def put_dataset(self, dataset_id, etag, dataset):
+		with self.lock:
+			entry = self.index["datasets"].get(str(dataset_id))
+			if entry is None or entry["etag"] != etag:
+				shutil.rmtree(self.entry_dir(dataset_id), ignore_errors=True)
+				self.index["datasets"][str(dataset_id)] = {"etag": etag, "used": time.time(), "files": {}}
+		self.store(dataset_id, etag, "dataset.json", lambda file: file.write(json.dumps(dataset).encode("utf-8")))
+
+	def store(self, dataset_id, version, name, write, **fields):
+		"""Write file ``name`` of an entry through ``write(file)``.
+
+		Nothing is stored if the entry has moved on from ``version`` (or been
+		evicted) in the meantime. ``fields`` are saved in the entry's index.
+		"""
+		directory = self.entry_dir(dataset_id)
+		temporary = directory / f".{uuid.uuid4().hex}.tmp"
+		try:
+			directory.mkdir(parents=True, exist_ok=True)
+			with open(temporary, "wb") as file:
+				write(file)
+			with self.lock:
+				entry = self.index["datasets"].get(str(dataset_id))
+				if entry is None or entry["etag"] != version:
+					return False
+				os.replace(temporary, directory / name)
+				entry["files"][name] = (directory / name).stat().st_size
+				entry["used"] = time.time()
+				entry.update(fields)
+				self.evict()
+				self.save_index()
+				return True
+		except OSError:
+			return False
+		finally:
+			with suppress(OSError):
+				temporary.unlink()
+
+	def evict(self):
+		# Called with the lock held.
+		entries = self.index["datasets"]
+		total = sum(sum(entry["files"].values()) for entry in entries.values())
+		for key in sorted(entries, key=lambda key: entries[key]["used"]):
+			if total <= self.max_bytes:
+				break
+			total -= sum(entries.pop(key)["files"].values())
+			shutil.rmtree(self.root / key, ignore_errors=True)
+
+	def history(self):
+		"""Return ``(etag, items)`` of the cached history, or ``(None, None)``."""
+		with self.lock:
+			history = self.index["history"] or {}
+			return history.get("etag"), history.get("items")
+
+	def put_history(self, etag, items):
+		with self.lock:
+			self.index["history"] = {"etag": etag, "items": items}
+			self.save_index()
+
+	def latest(self):
+		with self.lock:
+			return self.index["latest"]
+
+	def set_latest(self, dataset_id):
+		with self.lock:
+			self.index["latest"] = dataset_id
+			self.save_index()
+
+	def flush(self):
+		"""Write the last-use times of entries read since the index was saved."""
+		with self.lock:
+			if self.dirty:
+				self.save_index()
+
+	def save_index(self):
+		# Called with the lock held; replaced atomically so a crash cannot
+		# leave a truncated index behind.
+		path = self.root / "index.json"
+		temporary = path.with_suffix(".tmp")
+		try:
+			temporary.write_text(json.dumps(self.index))
+			os.replace(temporary, path)
+			self.dirty = False
+		except OSError:
+			pass
+
+
+def column_array(values):
+	"""Turn one column of a columnar page into a NumPy array."""
+	array = np.asarray(values)
+	if array.dtype.kind in "fiu":
+		return array.astype(np.float64)
+	return np.asarray(values, dtype=object)
+
+
+class DatasetTableModel(QAbstractTableModel):
+	"""Rows of one dataset, held as one NumPy buffer per column.
+
+	Only the rows fetched so far are in the model. The view asks for the next
+	page through ``fetchMore`` when it is scrolled to the end, and it only
+	ever reads the visible cells through ``data``. Sorting by a column
+	reloads from the server's ``/rows/?ordering=`` rather than sorting here.
+	Once every row has been loaded in server order the rows are written to
+	the cache, and later loads of the same dataset version come from there.
+	"""
+
+	failed = pyqtSignal(str)
+
+	def __init__(self, api, auth, cache, parent=None):
+		super().__init__(parent)
+		self.api = api
+		self.auth = auth
+		self.cache = cache
+		self.dataset_id = None
+		self.version = None
+		self.columns = []
+		self.ordering = None
+		self.reset_rows()
+
+	def reset_rows(self):
+		self.api.cancel("rows")
+		self.buffers = {}
+		self.loaded = 0
+		self.total = 0
+		self.fetching = False
+		self.from_cache = False
+
+	def load(self, dataset_id, columns):
+		self.beginResetModel()
+		self.dataset_id = dataset_id
+		self.version = self.cache.version(dataset_id)
+		self.columns = list(columns)
+		self.ordering = None
+		self.reset_rows()
+		self.endResetModel()
+		self.fetch_page()
+
+	def rowCount(self, parent=QModelIndex()):
+		return 0 if parent.isValid() else self.loaded
+
+	def columnCount(self, parent=QModelIndex()):
+		return 0 if parent.isValid() else len(self.columns)
+
+	def data(self, index, role=Qt.DisplayRole):
+		if not index.isValid():
+			return None
+		values = self.buffers.get(self.columns[index.column()])
+		if values is None:
+			return None
+		numeric = values.dtype.kind == "f"
+		if role == Qt.TextAlignmentRole:
+			return int((Qt.AlignRight if numeric else Qt.AlignLeft) | Qt.AlignVCenter)
+		if role != Qt.DisplayRole:
+			return None
+		value = values[index.row()]
+		if numeric:
+			return "" if np.isnan(value) else str(float(value))
+		return "" if value is None else str(value)
+
+	def headerData(self, section, orientation, role=Qt.DisplayRole):
+		if role != Qt.DisplayRole:
+			return None
+		if orientation == Qt.Horizontal:
+			return self.columns[section] if section < len(self.columns) else None
+		return str(section + 1)
+
+	def canFetchMore(self, parent=QModelIndex()):
+		if parent.isValid() or self.fetching or self.dataset_id is None:
+			return False
+		return self.loaded < self.total
+
+	def fetchMore(self, parent=QModelIndex()):
+		if self.canFetchMore(parent):
+			self.fetch_page()
+
+	def sort(self, column, order=Qt.AscendingOrder):
+		ordering = None
+		if 0 <= column < len(self.columns):
+			ordering = ("-" if order == Qt.DescendingOrder else "") + self.columns[column]
+		if self.dataset_id is None or ordering == self.ordering:
+			return
+		self.beginResetModel()
+		self.ordering = ordering
+		self.reset_rows()
+		self.endResetModel()
+		self.fetch_page()
+
+	def fetch_page(self):
+		if not self.loaded and self.ordering is None:
+			cached = self.cache.rows(self.dataset_id)
+			if cached:
+				self.from_cache = True
+				self.page_loaded((len(next(iter(cached.values()))), cached))
+				return
+		self.fetching = True
+		dataset_id = self.dataset_id
+		params = {"limit": ROWS_PAGE_SIZE, "offset": self.loaded}
+		if self.ordering:
+			params["ordering"] = self.ordering
+		auth = self.auth()
+
+		def fetch(worker):
+			body = self.api.request(
+				"GET",
+				f"/datasets/{dataset_id}/rows/",
+				params=params,
+				headers={"Accept": COLUMNAR_MEDIA_TYPE},
+				auth=auth,
+				timeout=30,
+			).json()
+			return body["count"], {column: column_array(values) for column, values in body["results"].items()}
+
+		self.api.submit("rows", fetch, self.page_loaded, self.page_failed)
+
+	def page_loaded(self, page):
+		count, columns = page
+		self.fetching = False
+		if not self.buffers:
+			# The first page gives the row count, so buffers are sized once.
+			self.total = count
+			self.buffers = {column: np.empty(count, dtype=values.dtype) for column, values in columns.items()}
+		start = self.loaded
+		rows = min(len(next(iter(columns.values()), ())), self.total - start)
+		if rows <= 0:
+			return
+		self.beginInsertRows(QModelIndex(), start, start + rows - 1)
+		for column, values in columns.items():
+			self.buffers[column][start:start + rows] = values[:rows]
+		self.loaded += rows
+		self.endInsertRows()
+		if self.loaded == self.total and self.ordering is None and not self.from_cache:
+			self.save_rows()
+
+	def save_rows(self):
+		dataset_id = self.dataset_id
+		version = self.version
+		buffers = dict(self.buffers)
+
+		def save(worker):
+			arrays = {}
+			for column, values in buffers.items():
+				if values.dtype == object:
+					# Fixed-width strings load back without unpickling.
+					values = np.array(["" if value is None else str(value) for value in values], dtype=str)
+				arrays[column] = values
+			return self.cache.store(dataset_id, version, "rows.npz", lambda file: np.savez(file, **arrays))
+
+		self.api.submit(f"cache-{dataset_id}", save, lambda stored: None)
+
+	def page_failed(self, exc):
+		self.fetching = False
+		self.failed.emit("Failed to load rows.")
 
 
 class ChartWidget(FigureCanvas):
@@ -60,12 +624,24 @@ class MainWindow(QMainWindow):
 		self.password_input.setEchoMode(QLineEdit.Password)
 
 		self.status_label = QLabel("Ready")
+		self.progress_bar = QProgressBar()
+		self.progress_bar.hide()
 		self.summary_label = QLabel("No dataset loaded.")
 		self.summary_label.setWordWrap(True)
 		self.stats_label = QLabel("")
 		self.stats_label.setWordWrap(True)
 		self.history_list = QListWidget()
-		self.table = QTableWidget(0, 0)
+
+		self.api = ApiClient(API_URL)
+		self.cache = DatasetCache(user_cache_dir(), CACHE_MAX_BYTES)
+		self.table_model = DatasetTableModel(self.api, self.auth, self.cache, self)
+		self.table_model.failed.connect(self.set_status)
+		self.table = QTableView()
+		self.table.setModel(self.table_model)
+		# Fixed row heights let the view lay out rows without measuring them.
+		self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+		self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+		self.table.setSortingEnabled(True)
 
 		self.chart = ChartWidget()
 
@@ -90,6 +666,7 @@ class MainWindow(QMainWindow):
 		left_layout.addWidget(QLabel("Recent Datasets"))
 		left_layout.addWidget(self.history_list)
 		left_layout.addWidget(self.status_label)
+		left_layout.addWidget(self.progress_bar)
 
 		right_layout = QVBoxLayout()
 		right_layout.addWidget(self.summary_label)
@@ -108,89 +685,429 @@ class MainWindow(QMainWindow):
 		self.history_list.itemClicked.connect(self.load_from_history)
 
 		self.current_dataset_id = None
+		self.pending_job_id = None
+		self.job_timer = QTimer(self)
+		self.job_timer.timeout.connect(self.poll_job)
+		self.show_cached()
 		self.fetch_history()
 		self.fetch_latest()
 
+	def closeEvent(self, event):
+		self.job_timer.stop()
+		self.api.cancel_all()
+		self.api.pool.clear()
+		self.cache.flush()
+		super().closeEvent(event)
+
 	def auth(self):
 		return HTTPBasicAuth(self.username_input.text(), self.password_input.text())
 
 	def set_status(self, message):
 		self.status_label.setText(message)
 
+	def show_progress(self, done, total):
+		self.progress_bar.show()
+		if total:
+			# Scaled so byte counts above 2 GB still fit the bar's int range.
+			self.progress_bar.setRange(0, 1000)
+			self.progress_bar.setValue(int(done * 1000 // total))
+		else:
+			self.progress_bar.setRange(0, 0)
+
+	def hide_progress(self):
+		self.progress_bar.hide()
+
+	@staticmethod
+	def conditional_headers(etag):
+		return {"If-None-Match": etag} if etag else {}
+
+	def show_cached(self):
+		"""Show the history and latest dataset of the last run until the server answers."""
+		_, items = self.cache.history()
+		if items:
+			self.list_history(items)
+		_, dataset = self.cache.dataset(self.cache.latest())
+		if dataset is not None:
+			self.render_dataset(dataset)
+			self.set_status("Showing cached data; checking for updates...")
+
 	def fetch_history(self):
-		try:
-			response = requests.get(f"{API_URL}/history/", auth=self.auth(), timeout=10)
-			response.raise_for_status()
-			self.history_list.clear()
-			for item in response.json():
-				list_item = QListWidgetItem(f"{item['name']} ({item['uploaded_at']})")
-				list_item.setData(Qt.UserRole, item["id"])
-				self.history_list.addItem(list_item)
-			self.set_status("History loaded.")
-		except requests.RequestException:
+		etag, _ = self.cache.history()
+		headers = self.conditional_headers(etag)
+		auth = self.auth()
+		self.api.submit(
+			"history",
+			lambda worker: self.api.request("GET", "/history/", headers=headers, auth=auth, timeout=10),
+			self.show_history,
+			self.history_failed,
+		)
+
+	def show_history(self, response):
+		if response.status_code == 304:
+			self.set_status("History is up to date.")
+			return
+		items = response.json()
+		self.cache.put_history(response.headers.get("ETag"), items)
+		self.list_history(items)
+		self.set_status("History loaded.")
+
+	def history_failed(self, exc):
+		if self.history_list.count():
+			self.set_status("Server unreachable; showing cached history.")
+		else:
 			self.set_status("Failed to load history.")
 
+	def list_history(self, items):
+		self.history_list.clear()
+		for item in items:
+			list_item = QListWidgetItem(f"{item['name']} ({item['uploaded_at']})")
+			list_item.setData(Qt.UserRole, item["id"])
+			self.history_list.addItem(list_item)
+
 	def fetch_latest(self):
-		try:
-			response = requests.get(f"{API_URL}/datasets/latest/", auth=self.auth(), timeout=10)
-			if response.status_code == 404:
-				return
-			response.raise_for_status()
-			self.render_dataset(response.json())
-		except requests.RequestException:
-			pass
+		headers = self.conditional_headers(self.cache.version(self.cache.latest()))
+		auth = self.auth()
+		self.api.submit(
+			"dataset",
+			lambda worker: self.api.request(
+				"GET",
+				"/datasets/latest/",
+				params={"data": "false"},
+				headers=headers,
+				auth=auth,
+				timeout=10,
+			),
+			self.show_latest,
+			self.latest_failed,
+		)
+
+	def show_latest(self, response):
+		if response.status_code == 304:
+			self.set_status("Dataset is up to date.")
+			return
+		if response.status_code == 202:
+			# The first dataset is still being ingested; follow its job.
+			self.pending_job_id = response.json()["id"]
+			self.job_timer.start(JOB_POLL_INTERVAL_MS)
+			return
+		dataset = response.json()
+		self.cache.put_dataset(dataset["id"], response.headers.get("ETag"), dataset)
+		self.cache.set_latest(dataset["id"])
+		self.render_dataset(dataset)
+
+	def latest_failed(self, exc):
+		if self.current_dataset_id is not None:
+			self.set_status("Server unreachable; showing cached data.")
+		else:
+			self.set_status("Failed to load the latest dataset.")
 
 	def upload_csv(self):
-		file_path, _ = QFileDialog.getOpenFileName(self, "Select CSV", "", "CSV Files (*.csv)")
-		if not file_path:
+		file_paths, _ = QFileDialog.getOpenFileNames(
+			self, "Select CSV files or an archive", "", "CSV or archives (*.csv *.zip *.tar *.tar.gz *.tgz)"
+		)
+		if not file_paths:
+			return
+		if len(file_paths) > 1 or not file_paths[0].lower().endswith(".csv"):
+			self.upload_bulk(file_paths)
+			return
+		file_path = file_paths[0]
+		if os.path.getsize(file_path) >= RESUMABLE_THRESHOLD:
+			self.upload_resumable(file_path)
 			return
 
-		try:
-			with open(file_path, "rb") as file:
-				response = requests.post(
-					f"{API_URL}/upload/",
-					files={"file": file},
-					auth=self.auth(),
+		auth = self.auth()
+
+		def upload(worker):
+			with UploadBody([("file", file_path)], worker) as body:
+				return self.api.request(
+					"POST",
+					"/upload/",
+					params={"data": "false"},
+					data=body,
+					headers={"Prefer": "respond-async", "Content-Type": body.content_type},
+					auth=auth,
 					timeout=30,
 				)
-			response.raise_for_status()
+
+		self.set_status("Uploading...")
+		self.api.submit("upload", upload, self.upload_finished, self.upload_failed, self.show_progress)
+
+	def upload_finished(self, response):
+		self.hide_progress()
+		if response.status_code == 200:
+			# The server already had this exact file and returned that dataset.
 			self.render_dataset(response.json())
+			self.set_status("File already uploaded; showing existing dataset.")
+			return
+		self.pending_job_id = response.json()["id"]
+		self.set_status("Upload queued for processing...")
+		self.job_timer.start(JOB_POLL_INTERVAL_MS)
+
+	def upload_failed(self, exc):
+		self.hide_progress()
+		self.set_status("Upload failed.")
+		QMessageBox.warning(self, "Upload Failed", str(exc))
+
+	def upload_resumable(self, file_path):
+		key = self.resume_key(file_path)
+		auth = self.auth()
+
+		def upload(worker):
+			session = self.resume_session(key, auth) or self.start_session(file_path, auth)
+			self.save_resume_state(key, session["id"])
+			session_path = f"/uploads/{session['id']}/"
+			total = session["chunk_count"]
+			done = total - len(session["missing"])
+			worker.report(done, total)
+			with ThreadPoolExecutor(max_workers=UPLOAD_PARALLELISM) as pool:
+				futures = [
+					pool.submit(self.put_chunk, worker, session_path, file_path, index, session["chunk_size"], auth)
+					for index in session["missing"]
+				]
+				try:
+					for future in as_completed(futures):
+						future.result()
+						done += 1
+						worker.report(done, total)
+				except BaseException:
+					for future in futures:
+						future.cancel()
+					raise
+			response = self.api.request("POST", f"{session_path}complete/", auth=auth, timeout=30)
+			self.save_resume_state(key, None)
+			return response
+
+		self.set_status("Uploading in chunks...")
+		self.api.submit("upload", upload, self.resumable_finished, self.resumable_failed, self.show_progress)
+
+	def resumable_finished(self, response):
+		self.hide_progress()
+		body = response.json()
+		if "progress" not in body:
+			# Another request is still queueing the finished upload.
+			self.set_status("Upload complete; waiting for processing to start...")
+			return
+		self.pending_job_id = body["id"]
+		self.set_status("Upload queued for processing...")
+		self.job_timer.start(JOB_POLL_INTERVAL_MS)
+
+	def resumable_failed(self, exc):
+		self.hide_progress()
+		self.set_status("Upload interrupted; upload the same file again to resume.")
+		QMessageBox.warning(self, "Upload Interrupted", str(exc))
+
+	def start_session(self, file_path, auth):
+		response = self.api.request(
+			"POST",
+			"/uploads/",
+			json={"name": os.path.basename(file_path), "size": os.path.getsize(file_path)},
+			auth=auth,
+			timeout=30,
+		)
+		return response.json()
+
+	def resume_session(self, key, auth):
+		session_id = self.load_resume_state().get(key)
+		if not session_id:
+			return None
+		try:
+			response = self.api.request("GET", f"/uploads/{session_id}/", auth=auth, timeout=30)
+		except requests.RequestException:
+			return None
+		if response.json()["status"] != "uploading":
+			return None
+		return response.json()
+
+	def put_chunk(self, worker, session_path, file_path, index, chunk_size, auth):
+		worker.check()
+		with open(file_path, "rb") as file:
+			file.seek(index * chunk_size)
+			data = file.read(chunk_size)
+		for attempt in range(CHUNK_RETRIES):
+			worker.check()
+			try:
+				self.api.request(
+					"PUT",
+					f"{session_path}chunks/{index}/",
+					data=data,
+					headers={"Content-Type": "application/octet-stream"},
+					auth=auth,
+					timeout=120,
+				)
+				return
+			except requests.RequestException:
+				if attempt == CHUNK_RETRIES - 1:
+					raise
+
+	@staticmethod
+	def resume_key(file_path):
+		stat = os.stat(file_path)
+		return f"{os.path.abspath(file_path)}:{stat.st_size}:{int(stat.st_mtime)}"
+
+	@staticmethod
+	def load_resume_state():
+		try:
+			return json.loads(RESUME_STATE_PATH.read_text())
+		except (OSError, ValueError):
+			return {}
+
+	def save_resume_state(self, key, session_id):
+		state = self.load_resume_state()
+		if session_id:
+			state[key] = session_id
+		else:
+			state.pop(key, None)
+		try:
+			RESUME_STATE_PATH.write_text(json.dumps(state))
+		except OSError:
+			pass
+
+	def upload_bulk(self, file_paths):
+		auth = self.auth()
+
+		def upload(worker):
+			with UploadBody([("files", path) for path in file_paths], worker) as body:
+				return self.api.request(
+					"POST",
+					"/upload/bulk/",
+					data=body,
+					headers={"Content-Type": body.content_type},
+					auth=auth,
+					timeout=300,
+				)
+
+		self.set_status(f"Uploading {len(file_paths)} file(s)...")
+		self.api.submit("upload", upload, self.bulk_finished, self.upload_failed, self.show_progress)
+
+	def bulk_finished(self, response):
+		self.hide_progress()
+		results = response.json()["results"]
+		failed = [result for result in results if result["status"] == "failed"]
+		loaded = [result["dataset"] for result in results if result.get("dataset") and not result.get("evicted")]
+		self.set_status(f"Uploaded {len(results) - len(failed)} of {len(results)} file(s).")
+		if failed:
+			QMessageBox.warning(
+				self,
+				"Some Files Failed",
+				"\n".join(f"{result['name']}: {result['error'].get('error')}" for result in failed),
+			)
+		self.fetch_history()
+		if loaded:
+			self.load_dataset(loaded[-1])
+
+	def poll_job(self):
+		job_id = self.pending_job_id
+		auth = self.auth()
+		self.api.submit(
+			"job",
+			lambda worker: self.api.request("GET", f"/jobs/{job_id}/", auth=auth, timeout=10).json(),
+			self.show_job,
+		)
+
+	def show_job(self, job):
+		if not self.job_timer.isActive():
+			# A poll that was already in flight when the job finished.
+			return
+		if job["status"] == "succeeded":
+			self.job_timer.stop()
+			self.load_dataset(job["dataset"])
 			self.fetch_history()
 			self.set_status("Upload successful.")
-		except requests.RequestException as exc:
+		elif job["status"] == "failed":
+			self.job_timer.stop()
 			self.set_status("Upload failed.")
-			QMessageBox.warning(self, "Upload Failed", str(exc))
+			QMessageBox.warning(self, "Upload Failed", (job.get("error") or {}).get("error", "Ingestion failed"))
+		else:
+			self.set_status(f"Processing upload... {job['progress']:.0%}")
 
 	def load_from_history(self, item):
-		dataset_id = item.data(Qt.UserRole)
-		try:
-			response = requests.get(
-				f"{API_URL}/datasets/{dataset_id}/", auth=self.auth(), timeout=10
-			)
-			response.raise_for_status()
-			self.render_dataset(response.json())
-			self.set_status("Dataset loaded.")
-		except requests.RequestException:
-			self.set_status("Failed to load dataset.")
+		self.load_dataset(item.data(Qt.UserRole))
+
+	def load_dataset(self, dataset_id):
+		# A cached dataset is shown at once and then revalidated; a dataset
+		# whose ETag still matches comes back as an empty 304.
+		etag, cached = self.cache.dataset(dataset_id)
+		if cached is not None:
+			self.render_dataset(cached)
+			self.set_status("Showing cached dataset; checking for updates...")
+		headers = self.conditional_headers(etag)
+		auth = self.auth()
+		self.api.submit(
+			"dataset",
+			lambda worker: self.api.request(
+				"GET", f"/datasets/{dataset_id}/", params={"data": "false"}, headers=headers, auth=auth, timeout=10
+			),
+			self.dataset_loaded,
+			lambda exc: self.set_status(
+				"Server unreachable; showing cached dataset." if cached is not None else "Failed to load dataset."
+			),
+		)
+
+	def dataset_loaded(self, response):
+		if response.status_code != 304:
+			dataset = response.json()
+			self.cache.put_dataset(dataset["id"], response.headers.get("ETag"), dataset)
+			self.render_dataset(dataset)
+		self.set_status("Dataset loaded.")
 
 	def download_report(self):
 		if not self.current_dataset_id:
 			return
+		dataset_id = self.current_dataset_id
 		save_path, _ = QFileDialog.getSaveFileName(
-			self, "Save PDF Report", f"dataset-report-{self.current_dataset_id}.pdf", "PDF Files (*.pdf)"
+			self, "Save PDF Report", f"dataset-report-{dataset_id}.pdf", "PDF Files (*.pdf)"
 		)
 		if not save_path:
 			return
-		try:
-			response = requests.get(
-				f"{API_URL}/report/{self.current_dataset_id}/", auth=self.auth(), timeout=20
-			)
-			response.raise_for_status()
-			with open(save_path, "wb") as file:
-				file.write(response.content)
-			self.set_status("Report saved.")
-		except requests.RequestException:
-			self.set_status("Failed to download report.")
+		auth = self.auth()
+		version = self.cache.version(dataset_id)
+		etag, cached = self.cache.report(dataset_id)
+		headers = self.conditional_headers(etag)
+
+		def download(worker):
+			try:
+				response = self.api.request(
+					"GET", f"/report/{dataset_id}/", headers=headers, auth=auth, timeout=20, stream=True
+				)
+			except (requests.ConnectionError, requests.Timeout):
+				if cached is None:
+					raise
+				shutil.copyfile(cached, save_path)
+				return "Server unreachable; saved the cached report."
+			with response:
+				if response.status_code == 304:
+					shutil.copyfile(cached, save_path)
+					return "Report saved."
+				total = int(response.headers.get("Content-Length") or 0)
+				done = 0
+				try:
+					with open(save_path, "wb") as file:
+						for block in response.iter_content(DOWNLOAD_BLOCK_SIZE):
+							worker.check()
+							file.write(block)
+							done += len(block)
+							worker.report(done, total)
+				except Cancelled:
+					os.remove(save_path)
+					raise
+
+			def copy(file):
+				with open(save_path, "rb") as report:
+					shutil.copyfileobj(report, file)
+
+			self.cache.store(dataset_id, version, "report.pdf", copy, report_etag=response.headers.get("ETag"))
+			return "Report saved."
+
+		self.set_status("Downloading report...")
+		self.api.submit("report", download, self.report_saved, self.report_failed, self.show_progress)
+
+	def report_saved(self, message):
+		self.hide_progress()
+		self.set_status(message)
+
+	def report_failed(self, exc):
+		self.hide_progress()
+		self.set_status("Failed to download report.")
 
 	def render_dataset(self, dataset):
 		self.current_dataset_id = dataset.get("id")
@@ -220,17 +1137,12 @@ class MainWindow(QMainWindow):
 		distribution = summary.get("type_dist", {})
 		self.chart.plot_type_distribution(distribution)
 
-		data = dataset.get("data", [])
-		columns = dataset.get("columns", [])
-		self.table.setColumnCount(len(columns))
-		self.table.setRowCount(len(data))
-		self.table.setHorizontalHeaderLabels(columns)
-
-		for row_index, row in enumerate(data):
-			for col_index, col_name in enumerate(columns):
-				value = row.get(col_name, "")
-				item = QTableWidgetItem(str(value))
-				self.table.setItem(row_index, col_index, item)
+		self.fetch_rows(dataset.get("id"), dataset.get("columns", []))
+
+	def fetch_rows(self, dataset_id, columns):
+		self.table_model.load(dataset_id, columns)
+		# A new dataset starts in server order; clearing the indicator is then a no-op sort.
+		self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
 
 
 def main():
@@ -14,6 +14,7 @@ import './App.css';
 ChartJS.register(CategoryScale, LinearScale, BarElement, Tooltip, Legend);
 
 const API_URL = process.env.REACT_APP_API_URL || 'http://127.0.0.1:8000/api';
+const ROWS_PAGE_SIZE = 100;
 
 function App() {
   const [username, setUsername] = useState('admin');
@@ -21,6 +22,7 @@ function App() {
   const [selectedFile, setSelectedFile] = useState(null);
   const [currentDataset, setCurrentDataset] = useState(null);
   const [history, setHistory] = useState([]);
+  const [rows, setRows] = useState([]);
   const [status, setStatus] = useState('');
 
   const authConfig = useMemo(
@@ -44,7 +46,10 @@ function App() {
 
   const fetchLatest = useCallback(async () => {
     try {
-      const response = await axios.get(`${API_URL}/datasets/latest/`, authConfig);
+      const response = await axios.get(`${API_URL}/datasets/latest/`, {
+        ...authConfig,
+        params: { data: false },
+      });
       setCurrentDataset(response.data);
     } catch (error) {
       // ignore if empty
@@ -56,6 +61,22 @@ function App() {
     fetchLatest();
   }, [fetchHistory, fetchLatest]);
 
+  const datasetId = currentDataset?.id;
+
+  useEffect(() => {
+    if (!datasetId) {
+      setRows([]);
+      return;
+    }
+    axios
+      .get(`${API_URL}/datasets/${datasetId}/rows/`, {
+        ...authConfig,
+        params: { limit: ROWS_PAGE_SIZE },
+      })
+      .then((response) => setRows(response.data.results))
+      .catch(() => setStatus('Unable to load dataset rows.'));
+  }, [datasetId, authConfig]);
+
   const handleUpload = async () => {
     if (!selectedFile) {
       setStatus('Select a CSV file before uploading.');
@@ -69,6 +90,7 @@ function App() {
     try {
       const response = await axios.post(`${API_URL}/upload/`, formData, {
         ...authConfig,
+        params: { data: false },
         headers: { 'Content-Type': 'multipart/form-data' },
       });
       setCurrentDataset(response.data);
@@ -81,7 +103,10 @@ function App() {
 
   const handleSelectHistory = async (datasetId) => {
     try {
-      const response = await axios.get(`${API_URL}/datasets/${datasetId}/`, authConfig);
+      const response = await axios.get(`${API_URL}/datasets/${datasetId}/`, {
+        ...authConfig,
+        params: { data: false },
+      });
       setCurrentDataset(response.data);
       setStatus('Loaded dataset.');
     } catch (error) {
@@ -220,7 +245,7 @@ function App() {
                 </tr>
               </thead>
               <tbody>
-                {currentDataset?.data?.map((row, index) => (
+                {rows.map((row, index) => (
                   <tr key={`${row['Equipment Name']}-${index}`}>
                     <td>{row['Equipment Name']}</td>
                     <td>{row.Type}</td>